@@ -1,14 +1,21 @@
 import argparse
+import atexit
+import signal
 import sys
 import typing as T
+from datetime import datetime
 from pathlib import Path
 
 from xdg_base_dirs import xdg_config_home
 
-from pqcli.mechanic import Player
+from pqcli import random
+from pqcli.lingo import parse_timespan
+from pqcli.mechanic import Player, Simulation
+from pqcli.profiling import profiling
 from pqcli.roster import Roster
 from pqcli.ui.basic import BasicUserInterface
 from pqcli.ui.curses import CursesUserInterface
+from pqcli.ui.headless import HeadlessUserInterface
 
 SAVE_PATH = Path(xdg_config_home()) / "pqcli" / "save.dat"
 
@@ -47,6 +54,53 @@ def parse_args() -> argparse.Namespace:
         help=argparse.SUPPRESS,
     )
     parser.add_argument("--cheats", action="store_true", help="???")
+    parser.add_argument(
+        "--signal-stats",
+        type=Path,
+        metavar="FILE",
+        help=(
+            "count signals and time their listeners, and write the results "
+            "as JSON to FILE on exit or when sent SIGUSR2"
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="FILE",
+        help=(
+            "profile the game and write the cProfile statistics to FILE on "
+            "exit or when sent SIGUSR1"
+        ),
+    )
+    parser.add_argument(
+        "--trace-malloc",
+        type=int,
+        metavar="N",
+        help=(
+            "trace memory allocations and report the N source lines holding "
+            "the most memory on exit or when sent SIGUSR1"
+        ),
+    )
+    parser.add_argument(
+        "--trace-malloc-file",
+        type=Path,
+        metavar="FILE",
+        help=(
+            "write the --trace-malloc report to FILE instead of stderr; the "
+            "curses interface writes it next to the --profile output by "
+            "default, since stderr would end up on its screen"
+        ),
+    )
+    parser.add_argument(
+        "--rng",
+        choices=list(random.BACKENDS),
+        help=(
+            "random number generator for new characters and, with "
+            "--load-save, for the loaded one (default: standard for new "
+            "characters, whichever a loaded one has); buffered is faster "
+            "with the numpy extra installed"
+        ),
+    )
     parser.add_argument(
         "--list-saves",
         action="store_true",
@@ -58,7 +112,58 @@ def parse_args() -> argparse.Namespace:
         metavar="NUM",
         help="play chosen character",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--catch-up",
+        action="store_true",
+        help=(
+            "with --load-save, first replay the time that passed "
+            "since the character was last saved"
+        ),
+    )
+
+    group = parser.add_argument_group(
+        "headless mode",
+        "run the character chosen with --load-save without any interface "
+        "and without waiting, until any of these targets is reached; "
+        "then save and exit",
+    )
+    group.add_argument(
+        "--until-level", type=int, metavar="LEVEL", help="target level"
+    )
+    group.add_argument(
+        "--until-act", type=int, metavar="ACT", help="target act number"
+    )
+    group.add_argument(
+        "--for",
+        dest="duration",
+        type=parse_timespan,
+        metavar="DURATION",
+        help="game time to simulate, e.g. 90m, 12h or 1d12h",
+    )
+
+    args = parser.parse_args()
+    if args.catch_up and not args.load_save:
+        parser.error("--catch-up requires --load-save")
+    if (
+        args.until_level is not None
+        or args.until_act is not None
+        or args.duration is not None
+    ):
+        if not args.load_save:
+            parser.error("headless mode requires --load-save")
+        args.ui = HeadlessUserInterface
+    if (
+        args.trace_malloc is not None
+        and args.trace_malloc_file is None
+        and args.ui is CursesUserInterface
+    ):
+        if args.profile is None:
+            parser.error(
+                "--trace-malloc with the curses interface requires "
+                "--trace-malloc-file or --profile"
+            )
+        args.trace_malloc_file = args.profile.with_suffix(".malloc.txt")
+    return args
 
 
 def list_players(roster: Roster, file: T.Optional[T.Any] = None) -> None:
@@ -66,6 +171,25 @@ def list_players(roster: Roster, file: T.Optional[T.Any] = None) -> None:
         print(f"{i}. {player.name}", file=file)
 
 
+def catch_up(player: Player) -> None:
+    if player.last_save is None:
+        return
+    elapsed = (datetime.now() - player.last_save).total_seconds() * 1000
+    if elapsed <= 0:
+        return
+    print(f"Catching up {player.name}...")
+    report = Simulation(player).fast_forward(duration=elapsed)
+    print(f"Caught up on {report}")
+
+
+def switch_generator(player: Player, name: str) -> None:
+    # the new generator starts from a fresh seed; a character that replays in
+    # the original game's order keeps doing so
+    backend = random.BACKENDS[name]
+    if type(player.rng) is not backend:
+        player.rng = backend(str(datetime.now()), legacy=player.rng.legacy)
+
+
 def bootstrap_first_run(roster: Roster, args: argparse.Namespace) -> None:
     if roster.players or args.list_saves or args.load_save:
         return
@@ -81,8 +205,21 @@ def bootstrap_first_run(roster: Roster, args: argparse.Namespace) -> None:
             raise SystemExit(1)
 
 
+def record_signal_stats(path: Path) -> None:
+    from pqcli import signal_stats
+
+    signal_stats.enable()
+    atexit.register(signal_stats.dump, path)
+    if hasattr(signal, "SIGUSR2"):
+        signal.signal(
+            signal.SIGUSR2, lambda _signum, _frame: signal_stats.dump(path)
+        )
+
+
 def main() -> None:
     args = parse_args()
+    if args.signal_stats:
+        record_signal_stats(args.signal_stats)
     roster = Roster.load(SAVE_PATH)
 
     if args.list_saves:
@@ -97,12 +234,21 @@ def main() -> None:
             print("Invalid player. Available players:", file=sys.stderr)
             list_players(roster, file=sys.stderr)
             exit(1)
+        if args.rng:
+            switch_generator(player, args.rng)
+        if args.catch_up:
+            catch_up(player)
 
     bootstrap_first_run(roster, args)
 
     try:
         ui = args.ui(roster, player, args)
-        ui.run()
+        with profiling(
+            profile_path=args.profile,
+            malloc_limit=args.trace_malloc,
+            malloc_path=args.trace_malloc_file,
+        ):
+            ui.run()
     finally:
         if args.use_saves:
             roster.save()
@@ -0,0 +1,302 @@
+import argparse
+import csv
+import json
+import math
+import os
+import statistics
+import time
+import typing as T
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from pqcli import random
+from pqcli.config import CLASSES, RACES
+from pqcli.mechanic import (
+    InventoryItem,
+    Simulation,
+    StatsBuilder,
+    create_player,
+)
+
+HOUR = 60 * 60 * 1000
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+@dataclass
+class LevelRecord:
+    # where a character stands when it reaches a level
+    race: str
+    class_: str
+    sample: int
+    level: int
+    hours: float
+    gold: int
+    act: int
+    items_looted: int
+    items_sold: int
+
+
+@dataclass
+class ActRecord:
+    race: str
+    class_: str
+    sample: int
+    act: int
+    hours: float
+
+
+class _Tally:
+    # counts the items looted and sold one by one, not by stack: loot of a
+    # kind the character already holds only grows the quantity of its stack
+    def __init__(self) -> None:
+        self.looted = 0
+        self.sold = 0
+        self._held: T.Dict[str, int] = {}
+
+    def on_item_add(self, item: InventoryItem) -> None:
+        self.looted += item.quantity
+        self._held[item.name] = item.quantity
+
+    def on_item_change(self, item: InventoryItem) -> None:
+        self.looted += item.quantity - self._held.get(item.name, 0)
+        self._held[item.name] = item.quantity
+
+    def on_item_del(self, item: InventoryItem) -> None:
+        self.sold += item.quantity
+        self._held.pop(item.name, None)
+
+
+def simulate(
+    job: T.Tuple[int, int, int, int, str]
+) -> T.Tuple[T.List[LevelRecord], T.List[ActRecord]]:
+    # plays freshly rolled characters of one race and class up to a level.
+    # every character draws from its own generator, seeded by what it is, so
+    # the results do not depend on the number of workers or on which worker
+    # plays which character
+    race_idx, class_idx, samples, target_level, seed = job
+    race = RACES[race_idx]
+    class_ = CLASSES[class_idx]
+    levels: T.List[LevelRecord] = []
+    acts: T.List[ActRecord] = []
+
+    for sample in range(samples):
+        character_seed = f"{seed}-{race_idx}-{class_idx}-{sample}"
+        player = create_player(
+            name=character_seed,
+            race=race,
+            class_=class_,
+            stats=StatsBuilder(
+                random.Generator(f"{character_seed}-stats")
+            ).roll(),
+            rng=random.Generator(character_seed),
+        )
+        tally = _Tally()
+
+        def on_level_up() -> None:
+            levels.append(
+                LevelRecord(
+                    race=race.name,
+                    class_=class_.name,
+                    sample=sample,
+                    level=player.level,
+                    hours=player.elapsed / HOUR,
+                    gold=player.inventory.gold,
+                    act=player.quest_book.act,
+                    items_looted=tally.looted,
+                    items_sold=tally.sold,
+                )
+            )
+
+        def on_start_act(act: int) -> None:
+            acts.append(
+                ActRecord(
+                    race=race.name,
+                    class_=class_.name,
+                    sample=sample,
+                    act=act,
+                    hours=player.elapsed / HOUR,
+                )
+            )
+
+        player.connect("level_up", on_level_up)
+        player.quest_book.connect("start_act", on_start_act)
+        player.inventory.connect("item_add", tally.on_item_add)
+        player.inventory.connect("item_change", tally.on_item_change)
+        player.inventory.connect("item_del", tally.on_item_del)
+        Simulation(player).advance(
+            until=lambda: player.level >= target_level, quiet=False
+        )
+    return levels, acts
+
+
+def distribution(values: T.List[float]) -> T.Dict[str, float]:
+    if not values:
+        return {
+            "count": 0,
+            "mean": math.nan,
+            **{f"p{percent}": math.nan for percent in PERCENTILES},
+        }
+    if len(values) < 2:
+        quantiles = values * 99
+    else:
+        quantiles = statistics.quantiles(values, n=100, method="inclusive")
+    return {
+        "count": len(values),
+        "mean": statistics.fmean(values),
+        **{f"p{percent}": quantiles[percent - 1] for percent in PERCENTILES},
+    }
+
+
+def summarize(
+    levels: T.List[LevelRecord], acts: T.List[ActRecord]
+) -> T.Dict[str, T.Any]:
+    by_level: T.Dict[int, T.List[LevelRecord]] = {}
+    for record in levels:
+        by_level.setdefault(record.level, []).append(record)
+    by_act: T.Dict[int, T.List[ActRecord]] = {}
+    for act_record in acts:
+        by_act.setdefault(act_record.act, []).append(act_record)
+
+    return {
+        "levels": {
+            level: {
+                "hours": distribution([record.hours for record in records]),
+                "gold": distribution([record.gold for record in records]),
+                "act": distribution([record.act for record in records]),
+                "items_sold_per_hour": distribution(
+                    [
+                        record.items_sold / record.hours
+                        for record in records
+                        if record.hours
+                    ]
+                ),
+            }
+            for level, records in sorted(by_level.items())
+        },
+        "acts": {
+            act: {
+                "hours": distribution(
+                    [act_record.hours for act_record in act_records]
+                )
+            }
+            for act, act_records in sorted(by_act.items())
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="pqcli.balance",
+        description=(
+            "play freshly rolled characters of every race and class up to a "
+            "level and report how long it takes and how they fare"
+        ),
+    )
+    parser.add_argument(
+        "-l",
+        "--level",
+        type=int,
+        default=10,
+        help="level to play each character to (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-n",
+        "--samples",
+        type=int,
+        default=3,
+        help=(
+            "characters per combination of race and class "
+            "(default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--seed",
+        default="balance",
+        help="seed the characters are derived from (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--csv",
+        type=Path,
+        metavar="FILE",
+        help=(
+            "write where each character stood at each level and when it "
+            "started each act to FILE"
+        ),
+    )
+    parser.add_argument(
+        "--json",
+        type=Path,
+        metavar="FILE",
+        help="write the distributions per level and per act to FILE",
+    )
+    args = parser.parse_args()
+
+    jobs = [
+        (race_idx, class_idx, args.samples, args.level, args.seed)
+        for race_idx in range(len(RACES))
+        for class_idx in range(len(CLASSES))
+    ]
+    levels: T.List[LevelRecord] = []
+    acts: T.List[ActRecord] = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for job_levels, job_acts in executor.map(simulate, jobs):
+            levels.extend(job_levels)
+            acts.extend(job_acts)
+    wall_time = time.perf_counter() - start
+    summary = summarize(levels, acts)
+
+    print(
+        f"{len(jobs) * args.samples} characters played to level "
+        f"{args.level} in {wall_time:.0f}s"
+    )
+    print(
+        f"{'level':>5} {'hours p5':>10} {'median':>10} {'p95':>10} "
+        f"{'gold':>10} {'act':>6} {'sold/hour':>10}"
+    )
+    for level, stats in summary["levels"].items():
+        print(
+            f"{level:5d} {stats['hours']['p5']:10.1f} "
+            f"{stats['hours']['p50']:10.1f} {stats['hours']['p95']:10.1f} "
+            f"{stats['gold']['p50']:10.0f} {stats['act']['p50']:6.0f} "
+            f"{stats['items_sold_per_hour']['p50']:10.1f}"
+        )
+
+    if args.csv:
+        with args.csv.open("w", newline="") as handle:
+            # act records only fill the columns they have
+            writer = csv.DictWriter(
+                handle,
+                fieldnames=["record", *LevelRecord.__dataclass_fields__],
+            )
+            writer.writeheader()
+            for record in levels:
+                writer.writerow({"record": "level", **asdict(record)})
+            for act_record in acts:
+                writer.writerow({"record": "act", **asdict(act_record)})
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                {
+                    "level": args.level,
+                    "samples": args.samples,
+                    "seed": args.seed,
+                    **summary,
+                },
+                indent=4,
+            )
+            + "\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
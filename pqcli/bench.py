@@ -0,0 +1,460 @@
+import argparse
+import atexit
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing as T
+from pathlib import Path
+
+from pqcli import lingo, random
+from pqcli.config import CLASSES, RACES
+from pqcli.mechanic import (
+    Player,
+    Simulation,
+    StatsBuilder,
+    create_player,
+    monster_task,
+)
+from pqcli.roster import Roster
+
+# a scenario sets things up and returns a function to time together with the
+# number of operations that one call of it performs
+Scenario = T.Callable[[], T.Tuple[T.Callable[[], None], int]]
+
+SCENARIOS: T.Dict[str, Scenario] = {}
+
+
+def scenario(name: str) -> T.Callable[[Scenario], Scenario]:
+    def decorator(func: Scenario) -> Scenario:
+        SCENARIOS[name] = func
+        return func
+
+    return decorator
+
+
+def make_player(
+    level: int = 1,
+    seed: str = "bench",
+    generator: T.Type[random.Generator] = random.Generator,
+) -> Player:
+    player = create_player(
+        name="Bench",
+        race=RACES[0],
+        class_=CLASSES[0],
+        stats=StatsBuilder(generator(seed)).roll(),
+        rng=generator(seed),
+    )
+    with player.muted():
+        for _ in range(level - 1):
+            player.level_up()
+    return player
+
+
+_screen: T.Any = None
+
+
+def fake_screen(lines: int = 50, columns: int = 160) -> T.Any:
+    # a curses screen on a pseudo terminal of the given size, so that windows
+    # can be created and drawn without a real terminal; curses only writes to
+    # the terminal while it is set up and torn down, which is when the pseudo
+    # terminal stands in for stdin and stdout. The first call decides the size
+    global _screen
+    if _screen is not None:
+        return _screen
+
+    # pseudo terminals only exist on POSIX systems, and curses is only
+    # imported by the scenarios that draw, so that the rest of this module
+    # can be used where it is missing
+    import curses
+    import fcntl
+    import pty
+    import struct
+    import termios
+
+    master, slave = pty.openpty()
+    fcntl.ioctl(
+        slave, termios.TIOCSWINSZ, struct.pack("HHHH", lines, columns, 0, 0)
+    )
+    os.environ["TERM"] = "xterm-256color"
+    os.environ["LINES"] = str(lines)
+    os.environ["COLUMNS"] = str(columns)
+
+    def on_terminal(func: T.Callable[[], T.Any]) -> T.Any:
+        sys.stdout.flush()
+        saved = [os.dup(fd) for fd in (0, 1)]
+        try:
+            for fd in (0, 1):
+                os.dup2(slave, fd)
+            return func()
+        finally:
+            for fd, saved_fd in zip((0, 1), saved):
+                os.dup2(saved_fd, fd)
+                os.close(saved_fd)
+
+    def close() -> None:
+        on_terminal(curses.endwin)
+        os.close(slave)
+        os.close(master)
+
+    _screen = on_terminal(curses.initscr)
+    atexit.register(close)
+    return _screen
+
+
+def bench_ticks(
+    level: int, generator: T.Type[random.Generator] = random.Generator
+) -> T.Tuple[T.Callable[[], None], int]:
+    # ticks of a second of game time, which finish a task every few ticks
+    # like catching up or headless mode does
+    ticks = 20000
+    player = make_player(level=level, generator=generator)
+    simulation = Simulation(player)
+
+    def run() -> None:
+        with player.muted():
+            for _ in range(ticks):
+                simulation.tick(1000, carry=True)
+
+    return run, ticks
+
+
+@scenario("tick_1")
+def bench_tick_1() -> T.Tuple[T.Callable[[], None], int]:
+    return bench_ticks(level=1)
+
+
+@scenario("tick_50")
+def bench_tick_50() -> T.Tuple[T.Callable[[], None], int]:
+    return bench_ticks(level=50)
+
+
+@scenario("tick_500")
+def bench_tick_500() -> T.Tuple[T.Callable[[], None], int]:
+    return bench_ticks(level=500)
+
+
+@scenario("tick_buffered")
+def bench_tick_buffered() -> T.Tuple[T.Callable[[], None], int]:
+    return bench_ticks(level=50, generator=random.BufferedGenerator)
+
+
+def make_killer() -> T.Tuple[Player, T.Callable[[], None]]:
+    # a character at level 50 and a function that completes one kill of it,
+    # including the loot, the exp, quest and plot bars and picking the next
+    # monster
+    player = make_player(level=50)
+    simulation = Simulation(player)
+    # get past the prologue
+    simulation.advance(until=lambda: player.quest_book.act > 0)
+
+    def kill() -> None:
+        if player.inventory.encum_bar.done:
+            while len(player.inventory):
+                player.inventory.pop(0)
+        player.set_task(
+            monster_task(player.rng, player.level, player.quest_book.monster)
+        )
+        player.task_bar.reposition(player.task_bar.max_)
+        simulation.complete_task()
+
+    return player, kill
+
+
+@scenario("kill")
+def bench_kill() -> T.Tuple[T.Callable[[], None], int]:
+    # complete one kill after another
+    kills = 1000
+    player, kill = make_killer()
+
+    def run() -> None:
+        with player.muted():
+            for _ in range(kills):
+                kill()
+
+    return run, kills
+
+
+def kill_allocations(kills: int = 1000) -> T.Tuple[float, float]:
+    # the memory a kill allocates on top of what was held before it, at its
+    # peak, and the memory blocks that each kill leaves held, both averaged
+    # over `kills` kills after as many to warm up
+    player, kill = make_killer()
+    with player.muted():
+        for _ in range(kills):
+            kill()
+        gc.collect()
+        blocks = sys.getallocatedblocks()
+        for _ in range(kills):
+            kill()
+        gc.collect()
+        blocks = sys.getallocatedblocks() - blocks
+
+        peak = 0
+        tracemalloc.start()
+        try:
+            for _ in range(kills):
+                held = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                kill()
+                peak += tracemalloc.get_traced_memory()[1] - held
+        finally:
+            tracemalloc.stop()
+    return peak / kills, blocks / kills
+
+
+@scenario("monster_task")
+def bench_monster_task() -> T.Tuple[T.Callable[[], None], int]:
+    # pick monsters for characters of all levels, half of them with a quest
+    # monster to prefer
+    calls = 10000
+    rng = random.Generator("bench")
+    monster = monster_task(rng, 10, None).monster
+    levels = [rng.below(500) + 1 for _ in range(calls)]
+
+    def run() -> None:
+        for i, level in enumerate(levels):
+            monster_task(rng, level, monster if i % 2 else None)
+
+    return run, calls
+
+
+@scenario("generate_name")
+def bench_generate_name() -> T.Tuple[T.Callable[[], None], int]:
+    calls = 10000
+    rng = random.Generator("bench")
+
+    def run() -> None:
+        for _ in range(calls):
+            lingo.generate_name(rng)
+
+    return run, calls
+
+
+def make_roster(path: Path, count: int = 20) -> Roster:
+    # characters of different levels, each after a few hours of play to fill
+    # its inventory, spell book and quest log
+    players = []
+    for i in range(count):
+        player = make_player(level=1 + 25 * i, seed=f"roster-{i}")
+        Simulation(player).advance(duration=6 * 60 * 60 * 1000)
+        players.append(player)
+    return Roster(path, players)
+
+
+@scenario("roster_save")
+def bench_roster_save() -> T.Tuple[T.Callable[[], None], int]:
+    saves = 20
+    directory = tempfile.TemporaryDirectory()
+    roster = make_roster(Path(directory.name) / "pq.dat")
+
+    def run() -> None:
+        for _ in range(saves):
+            roster.save()
+        assert directory
+
+    return run, saves
+
+
+@scenario("roster_load")
+def bench_roster_load() -> T.Tuple[T.Callable[[], None], int]:
+    loads = 20
+    directory = tempfile.TemporaryDirectory()
+    path = Path(directory.name) / "pq.dat"
+    make_roster(path).save()
+
+    def run() -> None:
+        for _ in range(loads):
+            Roster.load(path)
+        assert directory
+
+    return run, loads
+
+
+@scenario("curses_sync")
+def bench_curses_sync() -> T.Tuple[T.Callable[[], None], int]:
+    # redraw all game windows from scratch, like after catching up; the
+    # windows are drawn to curses' buffers but never sent to the terminal
+    from pqcli.ui.curses.views import GameView
+
+    syncs = 200
+    screen = fake_screen()
+    directory = tempfile.TemporaryDirectory()
+    roster = make_roster(Path(directory.name) / "pq.dat", count=1)
+    player = roster.players[0]
+    view = GameView(screen, roster, player, argparse.Namespace(cheats=False))
+    view.start()
+
+    def run() -> None:
+        for _ in range(syncs):
+            for source in player.signal_sources:
+                source.emit("sync")
+        assert view and directory
+
+    return run, syncs
+
+
+@scenario("win_stat")
+def bench_win_stat() -> T.Tuple[T.Callable[[], None], int]:
+    calls = 10000
+    player = make_player(level=50)
+
+    def run() -> None:
+        with player.muted():
+            for _ in range(calls):
+                player.win_stat()
+
+    return run, calls
+
+
+@scenario("win_equipment")
+def bench_win_equipment() -> T.Tuple[T.Callable[[], None], int]:
+    calls = 10000
+    player = make_player(level=50)
+
+    def run() -> None:
+        with player.muted():
+            for _ in range(calls):
+                player.win_equipment()
+
+    return run, calls
+
+
+@scenario("level_up")
+def bench_level_up() -> T.Tuple[T.Callable[[], None], int]:
+    # level a fresh character up again and again, reading the best spell
+    # after each level like the character sheet does
+    levels = 1000
+
+    def run() -> None:
+        player = make_player()
+        with player.muted():
+            for _ in range(levels):
+                player.level_up()
+                player.spell_book.best
+
+    return run, levels
+
+
+@scenario("emit")
+def bench_emit() -> T.Tuple[T.Callable[[], None], int]:
+    # emit a signal that nothing is connected to
+    emits = 100000
+    bar = make_player().exp_bar
+
+    def run() -> None:
+        for _ in range(emits):
+            bar.emit("change")
+
+    return run, emits
+
+
+@scenario("emit_connected")
+def bench_emit_connected() -> T.Tuple[T.Callable[[], None], int]:
+    # emit a signal that a view is connected to
+    emits = 100000
+    bar = make_player().exp_bar
+    listener = _Listener()
+    bar.connect("change", listener.on_signal)
+
+    def run() -> None:
+        for _ in range(emits):
+            bar.emit("change")
+
+    return run, emits
+
+
+class _Listener:
+    def on_signal(self, *_user_data: T.Any) -> None:
+        pass
+
+
+def measure(setup: Scenario, repeat: int) -> T.Tuple[float, T.List[float]]:
+    # returns seconds per operation of each repetition, after one warm-up
+    func, ops = setup()
+    func()
+    timings: T.List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) / ops)
+    return statistics.median(timings), timings
+
+
+def percentile(timings: T.List[float], percent: int) -> float:
+    if len(timings) < 2:
+        return timings[0]
+    return statistics.quantiles(timings, n=100, method="inclusive")[
+        percent - 1
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="pqcli.bench")
+    parser.add_argument(
+        "scenarios",
+        nargs="*",
+        metavar="SCENARIO",
+        help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="repetitions per scenario"
+    )
+    parser.add_argument(
+        "-j",
+        "--json",
+        type=Path,
+        metavar="FILE",
+        help="also write the timings to FILE as JSON",
+    )
+    args = parser.parse_args()
+
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f"unknown scenario: {name}")
+
+    results: T.Dict[str, T.Any] = {}
+    print(f"{'':<20} {'median us/op':>14} {'p95 us/op':>14} {'ops/s':>14}")
+    for name in args.scenarios or SCENARIOS:
+        median, timings = measure(SCENARIOS[name], args.repeat)
+        p95 = percentile(timings, 95)
+        print(
+            f"{name:<20} {median * 1e6:14.2f} {p95 * 1e6:14.2f} "
+            f"{1 / median:14,.0f}"
+        )
+        results[name] = {
+            "median_us": median * 1e6,
+            "p95_us": p95 * 1e6,
+            "ops_per_s": 1 / median,
+            "timings_us": [timing * 1e6 for timing in timings],
+        }
+        if name == "kill":
+            peak, blocks = kill_allocations()
+            print(
+                f"{'':<20} {peak:14,.0f} bytes allocated at the peak of a "
+                f"kill, {blocks:.2f} blocks kept"
+            )
+            results[name].update(
+                peak_bytes_per_op=peak, blocks_kept_per_op=blocks
+            )
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                {
+                    "python": platform.python_version(),
+                    "repeat": args.repeat,
+                    "scenarios": results,
+                },
+                indent=4,
+            )
+            + "\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+import argparse
+import gc
+import pickle
+import tempfile
+import time
+import tracemalloc
+import typing as T
+import weakref
+from pathlib import Path
+
+from pqcli import random
+from pqcli.bench import make_player
+from pqcli.config import ARMORS, MONSTERS, SHIELDS, TITLES, WEAPONS
+from pqcli.mechanic import (
+    Simulation,
+    level_drift,
+    pick_equipment,
+    unnamed_monster,
+)
+from pqcli.roster import Roster
+
+# a check prints what it measured and returns whether it passed
+Check = T.Callable[[], bool]
+
+CHECKS: T.Dict[str, Check] = {}
+
+
+def check(name: str) -> T.Callable[[Check], Check]:
+    def decorator(func: Check) -> Check:
+        CHECKS[name] = func
+        return func
+
+    return decorator
+
+
+class _View:
+    def on_signal(self, *_user_data: T.Any) -> None:
+        pass
+
+
+def loaded_character_size(count: int = 50) -> float:
+    # bytes of memory that a character takes once loaded from a save, after a
+    # few hours of play to fill its inventory, spell book and quest log
+    players = []
+    for i in range(count):
+        player = make_player(seed=f"bench-{i}")
+        Simulation(player).advance(duration=6 * 60 * 60 * 1000)
+        players.append(player)
+    data = pickle.dumps(players)
+    del players
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        players = pickle.loads(data)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before) / count
+
+
+def view_switch_leftovers(switches: int = 10000) -> T.Tuple[int, int]:
+    # connect a view to every signal of a character and close it again, half
+    # of the time without disconnecting; returns how many views and
+    # connections are left over afterwards
+    player = make_player()
+    sources = player.signal_sources
+    views: "weakref.WeakSet[_View]" = weakref.WeakSet()
+    for i in range(switches):
+        view = _View()
+        views.add(view)
+        for source in sources:
+            for signal_name in source.signals:
+                source.connect(signal_name, view.on_signal)
+            source.emit("sync")
+        if i % 2:
+            for source in sources:
+                for signal_name in source.signals:
+                    source.disconnect(signal_name, view.on_signal)
+        del view
+    gc.collect()
+    connections = sum(
+        len(refs)
+        for source in sources
+        for refs in (source._connections or {}).values()
+    )
+    return len(views), connections
+
+
+# a sampler fails when its counts score above this, which a sampler that is
+# right only does once in about a million checks
+MAX_SCORE = 4.75
+
+
+def chi_square(counts: T.Sequence[int], probs: T.Sequence[float]) -> float:
+    # Pearson's statistic, with neighbouring outcomes pooled until each
+    # expects at least 5 draws, as a score on the standard normal scale:
+    # around 0 when the counts come from `probs`, and growing with the
+    # number of draws when they do not
+    total = sum(counts)
+    statistic = 0.0
+    bins = 0
+    observed = expected = 0.0
+    for count, prob in zip(counts, probs):
+        observed += count
+        expected += prob * total
+        if expected >= 5:
+            statistic += (observed - expected) ** 2 / expected
+            bins += 1
+            observed = expected = 0.0
+    if expected:
+        statistic += (observed - expected) ** 2 / max(expected, 1e-9)
+        bins += 1
+    if bins < 2:
+        # a single outcome, which the counts cannot differ on
+        return 0.0
+    dof = bins - 1
+    # Wilson-Hilferty transformation of the chi-square distribution
+    spread = 2 / (9 * dof)
+    return ((statistic / dof) ** (1 / 3) - (1 - spread)) / spread**0.5
+
+
+def low_distribution_errors(samples: int = 500000) -> T.Dict[str, float]:
+    # how far below_low and the pair of draws it replaces are from the
+    # exact distribution of the lower of two draws, for the sizes the game
+    # uses
+    errors: T.Dict[str, float] = {}
+    rng = random.Generator("distributions")
+    for num in (1, 2, 10, len(TITLES), 100, 1000):
+        probs = [(2 * (num - k) - 1) / num**2 for k in range(num)]
+        for name, draw in (
+            ("below_low", rng.below_low),
+            ("below_low_pair", rng.below_low_pair),
+        ):
+            counts = [0] * num
+            for _ in range(samples):
+                counts[draw(num)] += 1
+            errors[f"{name}({num})"] = chi_square(counts, probs)
+    return errors
+
+
+def drift_distribution_errors(samples: int = 200000) -> T.Dict[str, float]:
+    # how far level_drift is from the exact distribution of the original
+    # walk, which steps up with 1/5 chance, down with 1/5 chance and stays
+    # put otherwise, with each generator mode
+    errors: T.Dict[str, float] = {}
+    for steps in (1, 5, 50, 500):
+        probs = [1.0]
+        for _ in range(steps):
+            probs = [
+                (probs[k - 2] if 0 <= k - 2 < len(probs) else 0.0) / 5
+                + (probs[k - 1] if 0 <= k - 1 < len(probs) else 0.0) * 3 / 5
+                + (probs[k] if k < len(probs) else 0.0) / 5
+                for k in range(len(probs) + 2)
+            ]
+        # the original walk draws for every step, so it gets fewer samples
+        for name, legacy, draws in (
+            ("level_drift", False, samples),
+            ("drift_walk", True, max(samples // steps, 1000)),
+        ):
+            rng = random.Generator("distributions", legacy=legacy)
+            counts = [0] * len(probs)
+            for _ in range(draws):
+                counts[level_drift(rng, steps) + steps] += 1
+            errors[f"{name}({steps})"] = chi_square(counts, probs)
+    return errors
+
+
+def closest_probs(
+    keys: T.Sequence[int], goal: int, draws: int
+) -> T.List[float]:
+    # the chance of each item to be the first of `draws` uniform draws whose
+    # key is closest to the goal
+    total = len(keys)
+    distances = [abs(key - goal) for key in keys]
+    probs = []
+    for distance in distances:
+        closer = sum(other < distance for other in distances)
+        tied = sum(other == distance for other in distances)
+        probs.append(
+            (
+                (1 - closer / total) ** draws
+                - (1 - (closer + tied) / total) ** draws
+            )
+            / tied
+        )
+    return probs
+
+
+def closest_distribution_errors(
+    samples: int = 200000,
+) -> T.Dict[str, float]:
+    # how far the precomputed tables for monsters and equipment are from the
+    # exact distribution of the best of several draws, with each generator
+    # mode
+    cases: T.List[
+        T.Tuple[
+            str,
+            T.Sequence[T.Any],
+            T.Sequence[int],
+            int,
+            int,
+            T.Callable[[random.Generator], T.Any],
+        ]
+    ] = [
+        (
+            f"monster({level}, {iterations})",
+            MONSTERS,
+            [monster.level for monster in MONSTERS],
+            level,
+            iterations,
+            lambda rng, level=level, iterations=iterations: (
+                unnamed_monster(rng, level, iterations)
+            ),
+        )
+        for level, iterations in ((1, 4), (10, 1), (25, 3), (80, 5))
+    ] + [
+        (
+            f"{name}({goal})",
+            source,
+            [preset.quality for preset in source],
+            goal,
+            5,
+            lambda rng, source=source, goal=goal: (
+                pick_equipment(rng, source, goal)
+            ),
+        )
+        for name, source, goal in (
+            ("weapon", WEAPONS, 5),
+            ("armor", ARMORS, -2),
+            ("shield", SHIELDS, 20),
+        )
+    ]
+    errors: T.Dict[str, float] = {}
+    for label, items, keys, goal, iterations, pick in cases:
+        probs = closest_probs(keys, goal, 1 + iterations)
+        # closest first, so that the unlikely items are pooled together
+        order = sorted(range(len(items)), key=lambda idx: -probs[idx])
+        positions = {id(items[idx]): pos for pos, idx in enumerate(order)}
+        for prefix, legacy in (("", False), ("legacy ", True)):
+            rng = random.Generator("distributions", legacy=legacy)
+            counts = [0] * len(items)
+            for _ in range(samples):
+                counts[positions[id(pick(rng))]] += 1
+            errors[prefix + label] = chi_square(
+                counts, [probs[idx] for idx in order]
+            )
+    return errors
+
+
+@check("memory")
+def check_memory() -> bool:
+    # the size of a loaded character is only reported; views that outlive
+    # their windows fail the check
+    size = loaded_character_size()
+    print(f"{'loaded character':<20} {size / 1024:10.2f} KiB")
+    views, connections = view_switch_leftovers()
+    print(
+        f"{'view switches':<20} {views:10d} views and "
+        f"{connections} connections left over"
+    )
+    return not views and not connections
+
+
+@check("roster")
+def check_roster() -> bool:
+    # a character that was played and left keeps the time it was left at
+    # through later saves, so that catching up replays its offline time
+    first = make_player(seed="roster-1")
+    second = make_player(seed="roster-2")
+    with tempfile.TemporaryDirectory() as directory:
+        roster = Roster(Path(directory) / "pq.dat", [first, second])
+        roster.play(first)
+        roster.save()
+        roster.leave(first)
+        left_at = first.last_save
+        time.sleep(0.01)
+        roster.play(second)
+        roster.save()
+        saved = Roster.load(roster.path).players[0].last_save
+    kept = first.last_save == left_at and saved == left_at
+    print(
+        f"{'left character':<20} last save "
+        f"{'kept' if kept else 'moved'} by a later save"
+    )
+    return kept
+
+
+@check("distributions")
+def check_distributions() -> bool:
+    errors = {
+        **low_distribution_errors(),
+        **drift_distribution_errors(),
+        **closest_distribution_errors(),
+    }
+    for name, error in errors.items():
+        print(f"{name:<20} {error:10.2f} chi-square score")
+    return all(error <= MAX_SCORE for error in errors.values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="pqcli.checks",
+        description=(
+            "check that closed views are let go and that the one-draw "
+            "samplers match the distributions of the draws they replace"
+        ),
+    )
+    parser.add_argument(
+        "checks",
+        nargs="*",
+        metavar="CHECK",
+        help=f"checks to run (default: all of {', '.join(CHECKS)})",
+    )
+    args = parser.parse_args()
+
+    for name in args.checks:
+        if name not in CHECKS:
+            parser.error(f"unknown check: {name}")
+
+    failed = [name for name in args.checks or CHECKS if not CHECKS[name]()]
+    if failed:
+        parser.exit(1, f"failed: {', '.join(failed)}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,41 @@
 import enum
+import functools
 import typing as T
 from dataclasses import dataclass
 
 
+@functools.lru_cache(maxsize=None)
+def _slot_names(cls: type) -> T.Tuple[str, ...]:
+    return tuple(
+        name
+        for klass in reversed(cls.__mro__)
+        for name in klass.__dict__.get("__slots__", ())
+        if name not in {"__dict__", "__weakref__"}
+    )
+
+
+class Slotted:
+    # pickles to and from a plain dict of attributes, like an object without
+    # __slots__ would, so that saves made before a class got its __slots__
+    # keep loading
+    __slots__ = ()
+
+    def __getstate__(self) -> T.Dict[str, T.Any]:
+        state = dict(getattr(self, "__dict__", {}))
+        for name in _slot_names(type(self)):
+            if hasattr(self, name):
+                state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state: T.Any) -> None:
+        if isinstance(state, tuple):
+            # (instance dict, slot values), as made by object.__reduce_ex__
+            instance_state, slot_state = state
+            state = {**(instance_state or {}), **(slot_state or {})}
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+
+
 class StatType(enum.Enum):
     strength = "STR"
     condition = "CON"
@@ -91,8 +124,10 @@ SPELLS = [
 ]
 
 
-@dataclass
-class Modifier:
+@dataclass(frozen=True)
+class Modifier(Slotted):
+    __slots__ = ("name", "quality")
+
     name: str
     quality: int
 
@@ -153,8 +188,10 @@ DEFENSE_BAD = [
 ]
 
 
-@dataclass
-class EquipmentPreset:
+@dataclass(frozen=True)
+class EquipmentPreset(Slotted):
+    __slots__ = ("name", "quality")
+
     name: str
     quality: int
 
@@ -420,8 +457,10 @@ BORING_ITEMS = [
 ]
 
 
-@dataclass
-class Monster:
+@dataclass(frozen=True)
+class Monster(Slotted):
+    __slots__ = ("name", "level", "item")
+
     name: str
     level: int
     item: T.Optional[str]
@@ -663,8 +702,10 @@ MONSTERS = [
 ]
 
 
-@dataclass
-class Race:
+@dataclass(frozen=True)
+class Race(Slotted):
+    __slots__ = ("name", "attr")
+
     name: str
     attr: T.List[StatType]
 
@@ -694,8 +735,10 @@ RACES = [
 ]
 
 
-@dataclass
-class Class:
+@dataclass(frozen=True)
+class Class(Slotted):
+    __slots__ = ("name", "attr")
+
     name: str
     attr: T.List[StatType]
 
@@ -0,0 +1,286 @@
+import argparse
+import hashlib
+import itertools
+import json
+import typing as T
+from pathlib import Path
+
+from pqcli import random
+from pqcli.config import CLASSES, RACES, EquipmentType
+from pqcli.mechanic import (
+    InventoryItem,
+    Player,
+    Simulation,
+    Spell,
+    StatsBuilder,
+    create_player,
+)
+
+GOLDEN_PATH = Path(__file__).parent / "golden.json"
+
+# the reference characters: seed, race, class and how they are played.
+# "ticks" plays regular ticks, "legacy" does the same with a legacy
+# generator, which replays exactly like the original game did, and "carry"
+# catches up on steps of game time of different lengths
+CHARACTERS = [
+    ("golden-1", "Half Orc", "Ur-Paladin", "ticks"),
+    ("golden-2", "Double Hobbit", "Voodoo Princess", "ticks"),
+    ("golden-3", "Half Halfling", "Mu-Fu Monk", "ticks"),
+    ("golden-4", "Half Orc", "Ur-Paladin", "legacy"),
+    ("golden-5", "Gyrognome", "Shiv-Knight", "carry"),
+]
+
+HOURS = 8
+
+HOUR = 60 * 60 * 1000
+
+# the steps a "carry" character catches up on, over and over: from a second
+# to an hour away from the game
+CARRY_STEPS = [1000, 60 * 1000, 10 * 60 * 1000, HOUR]
+
+# events hashed together in the golden file
+CHUNK_SIZE = 500
+
+
+class Recorder:
+    # writes down everything that happens to a character, one line per
+    # event, stamped with the game time in milliseconds
+    def __init__(self, player: Player) -> None:
+        self.player = player
+        self.events: T.List[str] = []
+        player.connect("new_task", self._on_new_task)
+        player.connect("level_up", self._on_level_up)
+        player.stats.connect("change", self._on_stats_change)
+        player.quest_book.connect("start_act", self._on_start_act)
+        player.quest_book.connect("start_quest", self._on_start_quest)
+        player.inventory.connect("item_add", self._on_item)
+        player.inventory.connect("item_change", self._on_item)
+        player.inventory.connect("item_del", self._on_item_del)
+        player.inventory.connect("gold_change", self._on_gold_change)
+        player.equipment.connect("change", self._on_equipment_change)
+        player.spell_book.connect("add", self._on_spell)
+        player.spell_book.connect("change", self._on_spell)
+
+    def _record(self, text: str) -> None:
+        self.events.append(f"{int(self.player.elapsed)} {text}")
+
+    def _on_new_task(self) -> None:
+        assert self.player.task is not None
+        self._record(f"task {self.player.task.description}")
+
+    def _on_level_up(self) -> None:
+        self._record(f"level {self.player.level}")
+
+    def _on_stats_change(self) -> None:
+        self._record(
+            "stats "
+            + " ".join(
+                f"{stat.value}={value}" for stat, value in self.player.stats
+            )
+        )
+
+    def _on_start_act(self, act: int) -> None:
+        self._record(f"act {act}")
+
+    def _on_start_quest(self, caption: str) -> None:
+        self._record(f"quest {caption}")
+
+    def _on_item(self, item: InventoryItem) -> None:
+        self._record(f"item {item.name} x{item.quantity}")
+
+    def _on_item_del(self, item: InventoryItem) -> None:
+        self._record(f"sold {item.name}")
+
+    def _on_gold_change(self) -> None:
+        self._record(f"gold {self.player.inventory.gold}")
+
+    def _on_equipment_change(
+        self, equipment_type: EquipmentType, name: str
+    ) -> None:
+        self._record(f"equip {equipment_type.value} {name}")
+
+    def _on_spell(self, spell: Spell) -> None:
+        self._record(f"spell {spell.name} {spell.level}")
+
+
+def describe(player: Player) -> str:
+    # everything about a character that the game shows, on one line
+    return " | ".join(
+        [
+            f"level {player.level} exp {int(player.exp_bar.position)}",
+            " ".join(f"{stat.value}={value}" for stat, value in player.stats),
+            f"gold {player.inventory.gold}",
+            ", ".join(
+                f"{item.name} x{item.quantity}" for item in player.inventory
+            ),
+            ", ".join(
+                f"{equipment_type.value} {name}"
+                for equipment_type, name in sorted(
+                    player.equipment, key=lambda pair: pair[0].value
+                )
+            ),
+            ", ".join(
+                f"{spell.name} {spell.level}" for spell in player.spell_book
+            ),
+            f"act {player.quest_book.act} "
+            f"quest {player.quest_book.current_quest}",
+            f"task {player.task.description if player.task else None} "
+            f"{int(player.task_bar.position)}",
+        ]
+    )
+
+
+def catch_up(player: Player, hours: int) -> T.List[str]:
+    # what the character looks like after each step it catches up on
+    simulation = Simulation(player)
+    states: T.List[str] = []
+    steps = itertools.cycle(CARRY_STEPS)
+    while player.elapsed < hours * HOUR:
+        simulation.fast_forward(
+            duration=min(next(steps), hours * HOUR - player.elapsed)
+        )
+        states.append(f"{int(player.elapsed)} {describe(player)}")
+    return states
+
+
+def run(
+    seed: str, race_name: str, class_name: str, mode: str, hours: int
+) -> T.List[str]:
+    legacy = mode == "legacy"
+    player = create_player(
+        name=seed,
+        race=next(race for race in RACES if race.name == race_name),
+        class_=next(class_ for class_ in CLASSES if class_.name == class_name),
+        stats=StatsBuilder(random.Generator(seed, legacy=legacy)).roll(),
+        rng=random.Generator(seed, legacy=legacy),
+    )
+    if mode == "carry":
+        return catch_up(player, hours)
+    recorder = Recorder(player)
+    # regular ticks, so that no tick finishes more than one task
+    Simulation(player).advance(ticks=hours * 60 * 60 * 10, quiet=False)
+    return recorder.events
+
+
+def chunk_hashes(events: T.List[str], chunk_size: int) -> T.List[str]:
+    return [
+        hashlib.sha256(
+            "\n".join(events[i : i + chunk_size]).encode()
+        ).hexdigest()[:16]
+        for i in range(0, len(events), chunk_size)
+    ]
+
+
+def first_divergence(
+    expected: T.List[str], actual: T.List[str]
+) -> T.Optional[int]:
+    for idx, (left, right) in enumerate(zip(expected, actual)):
+        if left != right:
+            return idx
+    if len(expected) != len(actual):
+        return min(len(expected), len(actual))
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="pqcli.golden",
+        description=(
+            "replay the reference characters and compare what happens to "
+            "them against the golden hashes"
+        ),
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="store the hashes of this run as the new golden hashes",
+    )
+    parser.add_argument(
+        "--record",
+        type=Path,
+        metavar="DIR",
+        help="also write the full event streams to DIR",
+    )
+    parser.add_argument(
+        "--diff",
+        type=Path,
+        metavar="DIR",
+        help=(
+            "show the first event that differs from the streams recorded to "
+            "DIR, e.g. by a run of a known good version"
+        ),
+    )
+    args = parser.parse_args()
+
+    golden = (
+        json.loads(GOLDEN_PATH.read_text()) if GOLDEN_PATH.exists() else {}
+    )
+    hours = golden.get("hours", HOURS)
+    chunk_size = golden.get("chunk_size", CHUNK_SIZE)
+    if args.update:
+        hours = HOURS
+        chunk_size = CHUNK_SIZE
+    results: T.Dict[str, T.Any] = {}
+    failed = False
+
+    for seed, race_name, class_name, mode in CHARACTERS:
+        events = run(seed, race_name, class_name, mode, hours)
+        hashes = chunk_hashes(events, chunk_size)
+        results[seed] = {"events": len(events), "chunks": hashes}
+
+        if args.record:
+            args.record.mkdir(parents=True, exist_ok=True)
+            (args.record / f"{seed}.txt").write_text("\n".join(events) + "\n")
+
+        expected = golden.get("characters", {}).get(seed)
+        if args.update or expected is None:
+            status = "recorded" if args.update else "no golden hashes"
+        elif expected == results[seed]:
+            status = "ok"
+        else:
+            failed = True
+            chunk = next(
+                (
+                    i
+                    for i, (left, right) in enumerate(
+                        zip(expected["chunks"], hashes)
+                    )
+                    if left != right
+                ),
+                min(len(expected["chunks"]), len(hashes)),
+            )
+            status = (
+                f"DIVERGES in events {chunk * chunk_size}"
+                f"-{(chunk + 1) * chunk_size - 1}"
+            )
+        print(f"{seed:<12} {len(events):6d} events  {status}")
+
+        if args.diff:
+            reference = (args.diff / f"{seed}.txt").read_text().splitlines()
+            idx = first_divergence(reference, events)
+            if idx is not None:
+                failed = True
+                print(f"  first difference at event {idx}:")
+                for line in reference[max(0, idx - 3) : idx + 1]:
+                    print(f"  - {line}")
+                for line in events[max(0, idx - 3) : idx + 1]:
+                    print(f"  + {line}")
+
+    if args.update:
+        GOLDEN_PATH.write_text(
+            json.dumps(
+                {
+                    "hours": hours,
+                    "chunk_size": chunk_size,
+                    "characters": results,
+                },
+                indent=4,
+            )
+            + "\n"
+        )
+    if failed:
+        parser.exit(1, "game behavior changed\n")
+
+
+if __name__ == "__main__":
+    main()
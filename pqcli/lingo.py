@@ -1,4 +1,5 @@
 import datetime
+import re
 import typing as T
 
 from pqcli import random
@@ -25,7 +26,28 @@ def format_timespan(timespan: datetime.timedelta) -> str:
     return f"~{format_float(num)}d"
 
 
-def generate_name() -> str:
+TIMESPAN_UNITS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+TIMESPAN_PART = re.compile(r"\s*(\d+(?:\.\d+)?)\s*([smhd]?)\s*")
+
+
+def parse_timespan(text: str) -> datetime.timedelta:
+    # accepts "90", "90s", "2h30m", "1d 12h" and the like
+    # read the numbers one after another, each match starting where the last
+    # one ended, rather than matching the whole text with a repeated group,
+    # which backtracks without end on text that does not match
+    seconds = 0.0
+    end = 0
+    for match in TIMESPAN_PART.finditer(text):
+        if match.start() != end:
+            break
+        seconds += float(match[1]) * TIMESPAN_UNITS[match[2] or "s"]
+        end = match.end()
+    if not end or end != len(text):
+        raise ValueError(f"invalid timespan: {text!r}")
+    return datetime.timedelta(seconds=seconds)
+
+
+def generate_name(rng: random.Generator = random.default_generator) -> str:
     parts = [
         "br|cr|dr|fr|gr|j|kr|l|m|n|pr||||r|sh|tr|v|wh|x|y|z".split("|"),
         "a|a|e|e|i|i|o|o|u|u|ae|ie|oo|ou".split("|"),
@@ -33,7 +55,7 @@ def generate_name() -> str:
     ]
     result = ""
     for i in range(6):
-        result += random.choice(parts[i % 3])
+        result += rng.choice(parts[i % 3])
     return result.title()
 
 
@@ -1,10 +1,15 @@
+import bisect
+import contextlib
 import datetime
+import inspect
 import itertools
 import logging
 import math
+import time
 import typing as T
-from collections import defaultdict
-from dataclasses import dataclass
+import weakref
+from collections import Counter
+from dataclasses import dataclass, field
 
 from pqcli import random
 from pqcli.config import (
@@ -32,12 +37,14 @@ from pqcli.config import (
     Modifier,
     Monster,
     Race,
+    Slotted,
     StatType,
 )
 from pqcli.lingo import (
     act_name,
     big,
     definite,
+    format_timespan,
     generate_name,
     indefinite,
     sick,
@@ -47,30 +54,170 @@ from pqcli.lingo import (
 
 logger = logging.getLogger(__name__)
 
+_T = T.TypeVar("_T")
 
-_SIGNALS: T.Dict[
-    T.Tuple["SignalMixin", str], T.List[T.Callable[..., T.Any]]
-] = defaultdict(list)
 
+_Connections = T.Dict[str, T.Tuple[T.Callable[[], T.Any], ...]]
+_ListenerTimer = T.Callable[
+    ["SignalMixin", str, T.Callable[..., T.Any], float], None
+]
+
+# when set, every listener that a signal is delivered to is timed and
+# reported here as (emitter, signal name, listener, seconds); left unset,
+# delivering a signal doesn't look at the clock
+listener_timer: T.Optional[_ListenerTimer] = None
+
+
+@dataclass
+class SignalBatch:
+    # emits held back until the batch is flushed, kept in order except that
+    # an object repeating a "change" with the same arguments is only told
+    # once, at the place of its first change. a tick that finishes a task
+    # emits a handful; one that spans hours emits thousands, so past
+    # max_events the batch lets go of them, and each object that emitted
+    # anything emits a single "sync" instead, like after Simulation.advance
+    max_events: T.ClassVar[int] = 256
+
+    events: T.List[T.Tuple["SignalMixin", str, T.Tuple[T.Any, ...]]] = field(
+        default_factory=list
+    )
+    changes: T.Set[T.Tuple[T.Any, ...]] = field(default_factory=set)
+    # the objects to sync, in order, once the batch has overflowed
+    overflow: T.Optional[T.Dict["SignalMixin", None]] = None
+
+    def add(
+        self, source: "SignalMixin", signal_name: str, user_data: T.Any
+    ) -> None:
+        if self.overflow is not None:
+            self.overflow[source] = None
+            return
+        if len(self.events) >= self.max_events:
+            self.overflow = dict.fromkeys(event[0] for event in self.events)
+            self.overflow[source] = None
+            self.events = []
+            self.changes = set()
+            return
+        if signal_name == "change":
+            # the events hold on to the arguments, so their ids stay unique
+            key = (source, *map(id, user_data))
+            if key in self.changes:
+                return
+            self.changes.add(key)
+        self.events.append((source, signal_name, user_data))
+
+    def flush(self) -> None:
+        events = self.events
+        overflow = self.overflow
+        self.events = []
+        self.changes = set()
+        self.overflow = None
+        if overflow is not None:
+            for source in overflow:
+                source._deliver("sync", ())
+            return
+        for source, signal_name, user_data in events:
+            source._deliver(signal_name, user_data)
+
+
+class SignalMixin(Slotted):
+    __slots__ = ("_muted", "_batch", "_connections")
+
+    def __init__(self) -> None:
+        # while set, emits are only counted here instead of being delivered
+        self._muted: T.Optional[T.Counter[str]] = None
+        # while set, emits are held back here instead of being delivered
+        self._batch: T.Optional[SignalBatch] = None
+        # references to the connected callbacks by signal name, left unset
+        # until something connects
+        self._connections: T.Optional[_Connections] = None
+
+    def __getstate__(self) -> T.Dict[str, T.Any]:
+        state = super().__getstate__()
+        del state["_muted"]
+        state.pop("_batch", None)
+        state.pop("_connections", None)
+        return state
+
+    def __setstate__(self, state: T.Any) -> None:
+        super().__setstate__(state)
+        self._muted = None
+        self._batch = None
+        self._connections = None
 
-class SignalMixin:
     def emit(self, signal_name: str, *user_data: T.Any) -> None:
-        for callback in _SIGNALS[self, signal_name]:
+        if self._muted is not None:
+            self._muted[signal_name] += 1
+            return
+        if self._connections is None:
+            return
+        if self._batch is not None:
+            self._batch.add(self, signal_name, user_data)
+            return
+        self._deliver(signal_name, user_data)
+
+    def _deliver(
+        self, signal_name: str, user_data: T.Tuple[T.Any, ...]
+    ) -> None:
+        if self._connections is None:
+            return
+        timer = listener_timer
+        for ref in self._connections.get(signal_name, ()):
+            callback = ref()
+            if callback is None:
+                continue
+            if timer is None:
+                callback(*user_data)
+                continue
+            start = time.perf_counter()
             callback(*user_data)
+            timer(self, signal_name, callback, time.perf_counter() - start)
 
     def connect(
         self, signal_name: str, callback: T.Callable[..., T.Any]
     ) -> None:
-        _SIGNALS[self, signal_name].append(callback)
+        # bound methods are held weakly so that a view that is gone doesn't
+        # stay alive, or keep being called, just because it never
+        # disconnected; anything else is held like a normal reference
+        if self._connections is None:
+            self._connections = {}
+        connections = self._connections
+
+        def forget(ref: T.Callable[[], T.Any]) -> None:
+            refs = tuple(
+                r for r in connections.get(signal_name, ()) if r != ref
+            )
+            if refs:
+                connections[signal_name] = refs
+            else:
+                connections.pop(signal_name, None)
+
+        ref: T.Callable[[], T.Any]
+        if inspect.ismethod(callback):
+            ref = weakref.WeakMethod(callback, forget)
+        else:
+            ref = lambda: callback  # noqa: E731
+        connections[signal_name] = connections.get(signal_name, ()) + (ref,)
 
     def disconnect(
         self, signal_name: str, callback: T.Callable[..., T.Any]
     ) -> None:
-        try:
-            idx = _SIGNALS[self, signal_name].index(callback)
-        except ValueError:
+        if self._connections is None:
             return
-        del _SIGNALS[self, signal_name][idx]
+        refs = list(self._connections.get(signal_name, ()))
+        for idx, ref in enumerate(refs):
+            if ref() == callback:
+                del refs[idx]
+                break
+        else:
+            return
+        if refs:
+            self._connections[signal_name] = tuple(refs)
+        else:
+            del self._connections[signal_name]
+
+
+STAT_TYPES = tuple(StatType)
+EQUIPMENT_TYPES = tuple(EquipmentType)
 
 
 def level_up_time(level: int) -> int:
@@ -79,9 +226,11 @@ def level_up_time(level: int) -> int:
 
 
 class Bar(SignalMixin):
-    signals = ["change"]
+    __slots__ = ("_position", "_max")
+    signals = ["change", "sync"]
 
     def __init__(self, max_: int, position: float = 0.0) -> None:
+        super().__init__()
         self._position = position
         self._max = max_
         self.emit("change")
@@ -118,10 +267,34 @@ class Bar(SignalMixin):
 
 
 class Stats(SignalMixin):
-    signals = ["change"]
+    # worked out from the values, so they are neither saved nor built for
+    # characters that are only loaded, until something asks for them
+    _derived_names = (
+        "_order",
+        "_positions",
+        "_best",
+        "_best_prime",
+        "_squares",
+    )
+    __slots__ = ("_values", "_derived", *_derived_names)
+    signals = ["change", "sync"]
 
     def __init__(self, values: T.Dict[StatType, int]) -> None:
+        super().__init__()
         self._values = values
+        self._derived = False
+
+    def __getstate__(self) -> T.Dict[str, T.Any]:
+        state = super().__getstate__()
+        state.pop("_derived", None)
+        for name in self._derived_names:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state: T.Any) -> None:
+        super().__setstate__(state)
+        # older saves may carry the derived values too
+        self._derived = False
 
     def __iter__(self) -> T.Iterator[T.Tuple[StatType, int]]:
         return iter(self._values.items())
@@ -131,24 +304,79 @@ class Stats(SignalMixin):
 
     @property
     def best(self) -> StatType:
-        return max(self, key=lambda kv: kv[1])[0]
+        if not self._derived:
+            self._refresh()
+        return self._best
 
     @property
     def best_prime(self) -> StatType:
-        return max(
-            (kv for kv in self if kv[0] in PRIME_STATS), key=lambda kv: kv[1]
-        )[0]
+        if not self._derived:
+            self._refresh()
+        return self._best_prime
+
+    @property
+    def squares_total(self) -> int:
+        if not self._derived:
+            self._refresh()
+        return self._squares[-1]
+
+    def pick_by_square(self, draw: int) -> StatType:
+        # the stat that a draw below squares_total lands on when the values
+        # squared are laid end to end in order
+        if not self._derived:
+            self._refresh()
+        idx = bisect.bisect_right(self._squares, draw)
+        return self._order[min(idx, len(self._order) - 1)]
 
     def increment(self, stat: StatType, qty: int = 1) -> None:
-        self._values[stat] += qty
+        old_value = self._values[stat]
+        value = self._values[stat] = old_value + qty
+        if qty < 0 or not self._derived:
+            self._refresh()
+        else:
+            idx = self._positions[stat]
+            delta = value**2 - old_value**2
+            for i in range(idx, len(self._squares)):
+                self._squares[i] += delta
+            if self._beats(stat, self._best):
+                self._best = stat
+            if stat in PRIME_STATS and self._beats(stat, self._best_prime):
+                self._best_prime = stat
         logger.info("Increased %s to %d", stat.value, self[stat])
         self.emit("change")
 
+    def _beats(self, stat: StatType, other: StatType) -> bool:
+        value = self._values[stat]
+        other_value = self._values[other]
+        return value > other_value or (
+            value == other_value
+            and self._positions[stat] < self._positions[other]
+        )
+
+    def _refresh(self) -> None:
+        self._order = list(self._values)
+        self._positions = {stat: idx for idx, stat in enumerate(self._order)}
+        # ties go to the stat that comes first, like max() would
+        self._best = max(self, key=lambda kv: kv[1])[0]
+        self._best_prime = max(
+            (kv for kv in self if kv[0] in PRIME_STATS), key=lambda kv: kv[1]
+        )[0]
+        self._squares = list(
+            itertools.accumulate(value**2 for _stat, value in self)
+        )
+        self._derived = True
+
 
 class QuestBook(SignalMixin):
-    signals = ["start_act", "start_quest"]
+    signals = ["start_act", "start_quest", "sync"]
+
+    # the current quest and the last 100 finished ones
+    log_size = 101
 
     def __init__(self) -> None:
+        super().__init__()
+        # a list takes less memory than a deque, and dropping the oldest of
+        # a hundred quests now and then costs next to nothing
         self._quests: T.List[str] = []
         self._act = 0
         self.plot_bar = Bar(max_=1)
@@ -159,6 +387,15 @@ class QuestBook(SignalMixin):
     def act(self) -> int:
         return self._act
 
+    def __setstate__(self, state: T.Any) -> None:
+        super().__setstate__(state)
+        # older saves kept every quest, and some kept them in a deque
+        if (
+            not isinstance(self._quests, list)
+            or len(self._quests) > self.log_size
+        ):
+            self._quests = list(self._quests)[-self.log_size :]
+
     @property
     def quests(self) -> T.List[str]:
         return self._quests
@@ -175,24 +412,46 @@ class QuestBook(SignalMixin):
 
     def add_quest(self, name: str) -> None:
         logger.info("Commencing quest: %s", name)
-        self._quests = self._quests[-100:]
         self._quests.append(name)
+        if len(self._quests) > self.log_size:
+            del self._quests[0]
 
 
-@dataclass
-class InventoryItem:
+@dataclass(slots=True)
+class InventoryItem(Slotted):
     name: str
     quantity: int
 
 
 class Inventory(SignalMixin):
-    signals = ["gold_change", "item_add", "item_change", "item_del"]
+    signals = ["gold_change", "item_add", "item_change", "item_del", "sync"]
 
     def __init__(self, capacity: int = 0) -> None:
+        super().__init__()
         self._gold = 0
+        # items in the order they were picked up, and by name once something
+        # is picked up; the index is neither saved nor built for characters
+        # that are only loaded
         self._items: T.List[InventoryItem] = []
+        self._index: T.Optional[T.Dict[str, InventoryItem]] = {}
+        self._quantity = 0
         self.encum_bar = Bar(max_=capacity)
 
+    def __getstate__(self) -> T.Dict[str, T.Any]:
+        state = super().__getstate__()
+        state.pop("_index", None)
+        return state
+
+    def __setstate__(self, state: T.Any) -> None:
+        super().__setstate__(state)
+        self._index = None
+        # older saves kept the items by name
+        if isinstance(self._items, dict):
+            self._items = list(self._items.values())
+        # and before that, did not count them
+        if "_quantity" not in state:
+            self._quantity = sum(item.quantity for item in self._items)
+
     @property
     def gold(self) -> int:
         return self._gold
@@ -216,36 +475,43 @@ class Inventory(SignalMixin):
         self.emit("gold_change")
 
     def pop(self, index: int) -> None:
-        item = self._items[index]
+        item = self._items.pop(index)
+        if self._index is not None:
+            del self._index[item.name]
         logger.info("Lost %s", indefinite(item.name, item.quantity))
-        self._items.pop(index)
+        self._quantity -= item.quantity
         self.sync_encumbrance()
         self.emit("item_del", item)
 
     def add(self, item_name: str, quantity: int) -> None:
         logger.info("Gained %s", indefinite(item_name, quantity))
-        for item in self._items:
-            if item.name == item_name:
-                item.quantity += quantity
-                self.emit("item_change", item)
-                break
+        index = self._index
+        if index is None:
+            index = self._index = {item.name: item for item in self._items}
+        item = index.get(item_name)
+        if item is not None:
+            item.quantity += quantity
+            self.emit("item_change", item)
         else:
             item = InventoryItem(name=item_name, quantity=quantity)
             self._items.append(item)
+            index[item_name] = item
             self.emit("item_add", item)
+        self._quantity += quantity
         self.sync_encumbrance()
 
     def sync_encumbrance(self) -> None:
-        self.encum_bar.reposition(sum(item.quantity for item in self._items))
+        self.encum_bar.reposition(self._quantity)
 
     def set_capacity(self, capacity: int) -> None:
         self.encum_bar.reset(capacity, self.encum_bar.position)
 
 
 class Equipment(SignalMixin):
-    signals = ["change"]
+    signals = ["change", "sync"]
 
     def __init__(self) -> None:
+        super().__init__()
         self._items: T.Dict[EquipmentType, str] = {
             EquipmentType.weapon: "Sharp Rock",
             EquipmentType.hauberk: "-3 Burlap",
@@ -269,17 +535,43 @@ class Equipment(SignalMixin):
         )
 
 
-@dataclass
-class Spell:
+@dataclass(slots=True)
+class Spell(Slotted):
     name: str
     level: int
 
 
 class SpellBook(SignalMixin):
-    signals = ["add", "change"]
+    signals = ["add", "change", "sync"]
 
     def __init__(self) -> None:
+        super().__init__()
         self._spells: T.List[Spell] = []
+        # positions of the spells in _spells by name and the best of them,
+        # which are neither saved nor built for characters that are only
+        # loaded, until something asks for them
+        self._index: T.Optional[T.Dict[str, int]] = {}
+        self._best: T.Optional[int] = None
+
+    def __getstate__(self) -> T.Dict[str, T.Any]:
+        state = super().__getstate__()
+        state.pop("_index", None)
+        state.pop("_best", None)
+        return state
+
+    def __setstate__(self, state: T.Any) -> None:
+        super().__setstate__(state)
+        # older saves may carry the index too, or only the list of spells
+        self._index = None
+        self._best = None
+
+    def _build_index(self) -> T.Dict[str, int]:
+        self._index = {}
+        self._best = None
+        for idx, spell in enumerate(self._spells):
+            self._index[spell.name] = idx
+            self._update_best(idx)
+        return self._index
 
     def __iter__(self) -> T.Iterator[Spell]:
         return iter(self._spells)
@@ -291,62 +583,82 @@ class SpellBook(SignalMixin):
         return len(self._spells)
 
     def add(self, spell_name: str, level: int) -> None:
-        for spell in self._spells:
-            if spell.name == spell_name:
-                spell.level += level
-                logger.info("Learned %s at level %d", spell_name, spell.level)
-                self.emit("change", spell)
-                break
+        index = self._index
+        if index is None:
+            index = self._build_index()
+        idx = index.get(spell_name)
+        if idx is not None:
+            spell = self._spells[idx]
+            spell.level += level
+            logger.info("Learned %s at level %d", spell_name, spell.level)
+            self._update_best(idx)
+            self.emit("change", spell)
         else:
+            idx = len(self._spells)
             spell = Spell(name=spell_name, level=level)
             self._spells.append(spell)
+            index[spell_name] = idx
             logger.info("Learned %s at level %d", spell.name, spell.level)
+            self._update_best(idx)
             self.emit("add", spell)
 
+    def _update_best(self, idx: int) -> None:
+        # spell levels only ever go up, so the spell at idx either takes over
+        # or nothing changes; ties go to the spell learned first, like max()
+        if self._best is None:
+            self._best = idx
+            return
+        level = self._spells[idx].level
+        best_level = self._spells[self._best].level
+        if level > best_level or (level == best_level and idx < self._best):
+            self._best = idx
+
     @property
     def best(self) -> T.Optional[Spell]:
-        if not self._spells:
+        if self._index is None:
+            self._build_index()
+        if self._best is None:
             return None
-        return max(self._spells, key=lambda spell: spell.level)
+        return self._spells[self._best]
 
 
-@dataclass
-class BaseTask:
+@dataclass(slots=True)
+class BaseTask(Slotted):
     description: str
     duration: int
 
 
-@dataclass
+@dataclass(slots=True)
 class KillTask(BaseTask):
     monster: T.Optional[Monster] = None
 
 
 class BuyTask(BaseTask):
-    pass
+    __slots__ = ()
 
 
 class HeadingToKillingFieldsTask(BaseTask):
-    pass
+    __slots__ = ()
 
 
 class HeadingToMarketTask(BaseTask):
-    pass
+    __slots__ = ()
 
 
 class SellTask(BaseTask):
-    pass
+    __slots__ = ()
 
 
 class RegularTask(BaseTask):
-    pass
+    __slots__ = ()
 
 
 class PlotTask(RegularTask):
-    pass
+    __slots__ = ()
 
 
 class Player(SignalMixin):
-    signals = ["new_task", "level_up"]
+    signals = ["new_task", "level_up", "sync"]
 
     def __init__(
         self,
@@ -355,13 +667,18 @@ class Player(SignalMixin):
         race: Race,
         class_: Class,
         stats: Stats,
+        rng: random.Generator,
     ) -> None:
+        super().__init__()
+        # everything that happens to the character is drawn from here
+        self.rng = rng
         self.name: str = name
         self.birthday: datetime.datetime = birthday
         self.race: Race = race
         self.class_: Class = class_
         self.stats: Stats = stats
         self.elapsed = 0.0
+        self.last_save: T.Optional[datetime.datetime] = None
 
         self.exp_bar = Bar(max_=level_up_time(1))
         self.level = 1
@@ -373,11 +690,64 @@ class Player(SignalMixin):
 
         self.task_bar = Bar(max_=1)
         self.task: T.Optional[BaseTask] = None
+        # a few tasks at most, so a list takes less memory than a deque
         self.queue: T.List[BaseTask] = []
 
     def __setstate__(self, obj: T.Any) -> None:
-        self.__dict__.update(obj)
+        super().__setstate__(obj)
         self.elapsed = obj.get("elapsed", 0.0)
+        self.last_save = obj.get("last_save", None)
+        if "rng" not in obj:
+            self.rng = random.Generator(str(datetime.datetime.now()))
+        # some saves kept the queue in a deque
+        if not isinstance(self.queue, list):
+            self.queue = list(self.queue)
+
+    @property
+    def signal_sources(self) -> T.List[SignalMixin]:
+        return [
+            self,
+            self.stats,
+            self.exp_bar,
+            self.quest_book,
+            self.quest_book.plot_bar,
+            self.quest_book.quest_bar,
+            self.inventory,
+            self.inventory.encum_bar,
+            self.equipment,
+            self.spell_book,
+            self.task_bar,
+        ]
+
+    @contextlib.contextmanager
+    def muted(self) -> T.Iterator[T.Dict[SignalMixin, T.Counter[str]]]:
+        emitted: T.Dict[SignalMixin, T.Counter[str]] = {}
+        for source in self.signal_sources:
+            emitted[source] = source._muted = Counter()
+        try:
+            yield emitted
+        finally:
+            for source in emitted:
+                source._muted = None
+
+    @contextlib.contextmanager
+    def batch(self) -> T.Iterator[SignalBatch]:
+        # hold back everything emitted inside and deliver it once at the end,
+        # so that listeners redraw once for each object that changed rather
+        # than once for each change
+        sources = self.signal_sources
+        if sources[0]._batch is not None:
+            yield sources[0]._batch
+            return
+        batch = SignalBatch()
+        for source in sources:
+            source._batch = batch
+        try:
+            yield batch
+        finally:
+            for source in sources:
+                source._batch = None
+            batch.flush()
 
     def set_task(self, task: BaseTask) -> None:
         self.task = task
@@ -393,11 +763,11 @@ class Player(SignalMixin):
         logger.info("Leveled up to level %d!", self.level)
         self.stats.increment(
             StatType.hp_max,
-            self.stats[StatType.condition] // 3 + 1 + random.below(4),
+            self.stats[StatType.condition] // 3 + 1 + self.rng.below(4),
         )
         self.stats.increment(
             StatType.mp_max,
-            self.stats[StatType.intelligence] // 3 + 1 + random.below(4),
+            self.stats[StatType.intelligence] // 3 + 1 + self.rng.below(4),
         )
         self.win_stat()
         self.win_stat()
@@ -408,18 +778,13 @@ class Player(SignalMixin):
     def win_stat(self) -> bool:
         chosen_stat: T.Optional[StatType] = None
 
-        if random.odds(1, 2):
-            chosen_stat = random.choice(list(StatType))
+        if self.rng.odds(1, 2):
+            chosen_stat = self.rng.choice(STAT_TYPES)
         else:
             # favor the best stat so it will tend to clump
-            t = sum(value**2 for _stat, value in self.stats)
-            t = random.below(t)
-            chosen_stat = None
-            for stat, value in self.stats:
-                chosen_stat = stat
-                t -= value**2
-                if t < 0:
-                    break
+            chosen_stat = self.stats.pick_by_square(
+                self.rng.below(self.stats.squares_total)
+            )
 
         assert chosen_stat is not None
         self.stats.increment(chosen_stat)
@@ -430,15 +795,16 @@ class Player(SignalMixin):
     def win_spell(self) -> None:
         self.spell_book.add(
             SPELLS[
-                random.below_low(
-                    min(self.stats[StatType.wisdom] + self.level, len(SPELLS))
+                below_low(
+                    self.rng,
+                    min(self.stats[StatType.wisdom] + self.level, len(SPELLS)),
                 )
             ],
             1,
         )
 
     def win_equipment(self) -> None:
-        choice = random.choice(list(EquipmentType))
+        choice = self.rng.choice(EQUIPMENT_TYPES)
 
         stuff: T.List[EquipmentPreset]
         better: T.List[Modifier]
@@ -453,7 +819,7 @@ class Player(SignalMixin):
             better = DEFENSE_ATTRIB
             worse = DEFENSE_BAD
 
-        equipment = pick_equipment(stuff, self.level)
+        equipment = pick_equipment(self.rng, stuff, self.level)
         name = equipment.name
         plus = self.level - equipment.quality
         if plus < 0:
@@ -462,7 +828,7 @@ class Player(SignalMixin):
             modifier_pool = better
         count = 0
         while count < 2 and plus:
-            modifier = random.choice(modifier_pool)
+            modifier = self.rng.choice(modifier_pool)
             if modifier.name in name:
                 break  # no repeats
             if abs(plus) < abs(modifier.quality):
@@ -480,7 +846,41 @@ class Player(SignalMixin):
         self.equipment.put(choice, name)
 
     def win_item(self) -> None:
-        self.inventory.add(special_item(), 1)
+        self.inventory.add(special_item(self.rng), 1)
+
+
+QUEST_REWARDS: T.Tuple[T.Callable[[Player], T.Any], ...] = (
+    Player.win_spell,
+    Player.win_equipment,
+    Player.win_stat,
+    Player.win_item,
+)
+
+
+@dataclass
+class FastForwardReport:
+    elapsed: float
+    tasks: int
+    levels: int
+    acts: int
+    quests: int
+    items: int
+    equipment: int
+    gold: int
+
+    def __str__(self) -> str:
+        return (
+            f"{format_timespan(datetime.timedelta(milliseconds=self.elapsed))}"
+            f" of game time: {self.tasks} tasks, {self.levels} levels, "
+            f"{self.acts} acts, {self.quests} quests, {self.items} items, "
+            f"{self.equipment} equipment upgrades, {self.gold} gold"
+        )
+
+
+# milliseconds that the trip between the killing fields and the market takes
+# either way, and that selling each kind of item takes
+MARKET_TRIP_DURATION = 4000
+SELL_DURATION = 1000
 
 
 class Simulation:
@@ -488,40 +888,96 @@ class Simulation:
         self.player = player
         self.last_tick = datetime.datetime.now()
 
-    def tick(self, elapsed: float = 100.0) -> None:
+    def tick(self, elapsed: float = 100.0, carry: bool = False) -> None:
+        task_bar = self.player.task_bar
+        if (
+            self.player.task is not None
+            and elapsed < task_bar.max_ - task_bar.position
+        ):
+            # only the task bar moves, so there is nothing to batch
+            self.player.elapsed += elapsed
+            task_bar.increment(elapsed)
+            return
+        # listeners hear about everything that happened once, at the end
+        with self.player.batch():
+            self._tick(elapsed, carry)
+
+    def _tick(self, elapsed: float, carry: bool) -> None:
         self.player.elapsed += elapsed
 
         if self.player.task is None:
-            self.player.set_task(RegularTask("Loading", 2000))
-            self.player.queue += [
-                RegularTask(
-                    "Experiencing an enigmatic and foreboding night vision",
-                    10000,
-                ),
-                RegularTask(
-                    "Much is revealed about that wise old bastard "
-                    "you'd underestimated",
-                    6000,
-                ),
-                RegularTask(
-                    "A shocking series of events leaves you "
-                    "alone and bewildered, but resolute",
-                    6000,
-                ),
-                RegularTask(
-                    "Drawing upon an unrealized reserve of determination, "
-                    "you set out on a long and dangerous journey",
-                    4000,
-                ),
-                PlotTask(f"Loading {act_name(1)}", 2000),
-            ]
-            self.player.quest_book.plot_bar.reset(28)
-            return
-
-        if not self.player.task_bar.done:
-            self.player.task_bar.increment(elapsed)
+            self.start()
+            if not carry:
+                return
+
+        if not carry:
+            if not self.player.task_bar.done:
+                self.player.task_bar.increment(elapsed)
+                return
+            self.complete_task()
             return
 
+        # spend the whole budget rather than dropping whatever is left over
+        # once the current task is done
+        while True:
+            task_bar = self.player.task_bar
+            if not task_bar.done:
+                remaining = task_bar.max_ - task_bar.position
+                if elapsed < remaining:
+                    task_bar.increment(elapsed)
+                    return
+                task_bar.reposition(task_bar.max_)
+                elapsed -= remaining
+            self.complete_task()
+            if elapsed <= 0:
+                return
+
+    def time_to_next_event(self) -> float:
+        # milliseconds until the current task is over; the exp, quest and
+        # plot bars only ever move when a task completes
+        task_bar = self.player.task_bar
+        if self.player.task is None or task_bar.done:
+            return 0.0
+        return task_bar.max_ - task_bar.position
+
+    def time_to_next_change(self, cells: int) -> float:
+        # milliseconds until the next event or until the task bar, drawn
+        # `cells` wide, fills another cell, whichever comes first
+        remaining = self.time_to_next_event()
+        task_bar = self.player.task_bar
+        if not remaining or cells <= 0:
+            return remaining
+        filled = int(task_bar.position * cells // task_bar.max_)
+        next_cell = (filled + 1) * task_bar.max_ / cells
+        return min(remaining, next_cell - task_bar.position)
+
+    def start(self) -> None:
+        self.player.set_task(RegularTask("Loading", 2000))
+        self.player.queue += [
+            RegularTask(
+                "Experiencing an enigmatic and foreboding night vision",
+                10000,
+            ),
+            RegularTask(
+                "Much is revealed about that wise old bastard "
+                "you'd underestimated",
+                6000,
+            ),
+            RegularTask(
+                "A shocking series of events leaves you "
+                "alone and bewildered, but resolute",
+                6000,
+            ),
+            RegularTask(
+                "Drawing upon an unrealized reserve of determination, "
+                "you set out on a long and dangerous journey",
+                4000,
+            ),
+            PlotTask(f"Loading {act_name(1)}", 2000),
+        ]
+        self.player.quest_book.plot_bar.reset(28)
+
+    def complete_task(self) -> None:
         # gain XP / level up
         gain = self.player.task and isinstance(self.player.task, KillTask)
         if gain:
@@ -553,59 +1009,78 @@ class Simulation:
 
         self.dequeue()
 
+    def advance(
+        self,
+        ticks: T.Optional[int] = None,
+        duration: T.Optional[float] = None,
+        until: T.Optional[T.Callable[[], bool]] = None,
+        quiet: bool = True,
+    ) -> T.Dict[SignalMixin, T.Counter[str]]:
+        # run either a number of regular ticks, or carry on for a duration in
+        # milliseconds and/or until a condition holds, in one go. when quiet,
+        # the player's signals are held back, and afterwards every object that
+        # would have emitted anything emits a single "sync" instead; the
+        # returned counts tell what was held back.
+        if (ticks is None) == (duration is None and until is None):
+            raise ValueError("expected either ticks or duration/until")
+
+        with contextlib.ExitStack() as stack:
+            emitted: T.Dict[SignalMixin, T.Counter[str]] = (
+                stack.enter_context(self.player.muted()) if quiet else {}
+            )
+            if ticks is not None:
+                for _ in range(ticks):
+                    self.tick()
+            elif until is None:
+                self.tick(T.cast(float, duration), carry=True)
+            else:
+                remaining = math.inf if duration is None else duration
+                while remaining > 0 and not until():
+                    step = min(self.time_to_next_event(), remaining)
+                    self.tick(step, carry=True)
+                    remaining -= step
+
+        for source, counts in emitted.items():
+            if counts:
+                source.emit("sync")
+        return emitted
+
+    def fast_forward(
+        self,
+        duration: T.Optional[float] = None,
+        until: T.Optional[T.Callable[[], bool]] = None,
+    ) -> FastForwardReport:
+        elapsed = self.player.elapsed
+        level = self.player.level
+        gold = self.player.inventory.gold
+        emitted = self.advance(duration=duration, until=until)
+
+        return FastForwardReport(
+            elapsed=self.player.elapsed - elapsed,
+            tasks=emitted[self.player]["new_task"],
+            levels=self.player.level - level,
+            acts=emitted[self.player.quest_book]["start_act"],
+            quests=emitted[self.player.quest_book]["start_quest"],
+            items=emitted[self.player.inventory]["item_add"]
+            + emitted[self.player.inventory]["item_change"],
+            equipment=emitted[self.player.equipment]["change"],
+            gold=self.player.inventory.gold - gold,
+        )
+
     def dequeue(self) -> None:
         while self.player.task_bar.done:
-            if isinstance(self.player.task, KillTask):
-                if (
-                    self.player.task.monster is None
-                    or self.player.task.monster.item is None
-                ):
-                    # npc
-                    self.player.win_item()
-                elif self.player.task.monster.item:
-                    self.player.inventory.add(
-                        (
-                            self.player.task.monster.name
-                            + " "
-                            + self.player.task.monster.item
-                        ).lower(),
-                        1,
-                    )
-
-            elif isinstance(self.player.task, BuyTask):
-                # buy some equipment
-                self.player.inventory.add_gold(-self.player.equip_price())
-                self.player.win_equipment()
-
-            elif isinstance(self.player.task, (HeadingToMarketTask, SellTask)):
-                if isinstance(self.player.task, SellTask):
-                    item = self.player.inventory[0]
-                    amount = item.quantity * self.player.level
-                    if " of " in item.name:
-                        amount *= (1 + random.below_low(10)) * (
-                            1 + random.below_low(self.player.level)
-                        )
-                    self.player.inventory.pop(0)
-                    self.player.inventory.add_gold(amount)
-                if len(self.player.inventory):
-                    item = self.player.inventory[0]
-                    self.player.set_task(
-                        SellTask(
-                            "Selling " + indefinite(item.name, item.quantity),
-                            1000,
-                        )
-                    )
-                    break
-
-            elif isinstance(self.player.task, PlotTask):
-                self.complete_act()
+            handler = self.task_handlers.get(type(self.player.task))
+            if handler is not None and handler(self):
+                break
 
             old = self.player.task
             if self.player.queue:
                 self.player.set_task(self.player.queue.pop(0))
             elif self.player.inventory.encum_bar.done:
                 self.player.set_task(
-                    HeadingToMarketTask("Heading to market to sell loot", 4000)
+                    HeadingToMarketTask(
+                        "Heading to market to sell loot", MARKET_TRIP_DURATION
+                    )
                 )
             elif not isinstance(old, (KillTask, HeadingToKillingFieldsTask)):
                 if self.player.inventory.gold > self.player.equip_price():
@@ -617,16 +1092,74 @@ class Simulation:
                 else:
                     self.player.set_task(
                         HeadingToKillingFieldsTask(
-                            "Heading to the killing fields", 4000
+                            "Heading to the killing fields",
+                            MARKET_TRIP_DURATION,
                         )
                     )
             else:
                 self.player.set_task(
                     monster_task(
-                        self.player.level, self.player.quest_book.monster
+                        self.player.rng,
+                        self.player.level,
+                        self.player.quest_book.monster,
                     )
                 )
 
+    # the handlers below finish off a task of a given type and return whether
+    # they have already set the next task
+
+    def _complete_kill(self) -> bool:
+        monster = T.cast(KillTask, self.player.task).monster
+        if monster is None or monster.item is None:
+            # npc
+            self.player.win_item()
+        elif monster.item:
+            self.player.inventory.add(loot_name(monster), 1)
+        return False
+
+    def _complete_buy(self) -> bool:
+        # buy some equipment
+        self.player.inventory.add_gold(-self.player.equip_price())
+        self.player.win_equipment()
+        return False
+
+    def _complete_sell(self) -> bool:
+        item = self.player.inventory[0]
+        amount = item.quantity * self.player.level
+        if " of " in item.name:
+            amount *= (1 + below_low(self.player.rng, 10)) * (
+                1 + below_low(self.player.rng, self.player.level)
+            )
+        self.player.inventory.pop(0)
+        self.player.inventory.add_gold(amount)
+        return self._sell_next()
+
+    def _sell_next(self) -> bool:
+        if not len(self.player.inventory):
+            return False
+        item = self.player.inventory[0]
+        self.player.set_task(
+            SellTask(
+                "Selling " + indefinite(item.name, item.quantity),
+                SELL_DURATION,
+            )
+        )
+        return True
+
+    def _complete_plot(self) -> bool:
+        self.complete_act()
+        return False
+
+    task_handlers: T.Dict[
+        T.Type[BaseTask], T.Callable[["Simulation"], bool]
+    ] = {
+        KillTask: _complete_kill,
+        BuyTask: _complete_buy,
+        HeadingToMarketTask: _sell_next,
+        SellTask: _complete_sell,
+        PlotTask: _complete_plot,
+    }
+
     def complete_act(self) -> None:
         self.player.quest_book.increment_act()
         self.player.quest_book.plot_bar.reset(
@@ -637,38 +1170,35 @@ class Simulation:
             self.player.win_equipment()
 
     def complete_quest(self) -> None:
-        self.player.quest_book.quest_bar.reset(50 + random.below_low(1000))
+        self.player.quest_book.quest_bar.reset(
+            50 + below_low(self.player.rng, 1000)
+        )
         if self.player.quest_book.current_quest:
             logger.info(
                 "Quest completed: %s", self.player.quest_book.current_quest
             )
-            random.choice(
-                [
-                    self.player.win_spell,
-                    self.player.win_equipment,
-                    self.player.win_stat,
-                    self.player.win_item,
-                ]
-            )()
+            self.player.rng.choice(QUEST_REWARDS)(self.player)
 
         self.player.quest_book.monster = None
         caption = ""
-        choice = random.below(5)
+        choice = self.player.rng.below(5)
         if choice == 0:
             self.player.quest_book.monster = unnamed_monster(
-                self.player.level, iterations=3
+                self.player.rng, self.player.level, iterations=3
             )
             caption = "Exterminate " + definite(
                 self.player.quest_book.monster.name, 2
             )
         elif choice == 1:
-            caption = "Seek " + definite(interesting_item(), 1)
+            caption = "Seek " + definite(interesting_item(self.player.rng), 1)
         elif choice == 2:
-            caption = "Deliver this " + boring_item()
+            caption = "Deliver this " + boring_item(self.player.rng)
         elif choice == 3:
-            caption = "Fetch me " + indefinite(boring_item(), 1)
+            caption = "Fetch me " + indefinite(boring_item(self.player.rng), 1)
         elif choice == 4:
-            monster = unnamed_monster(self.player.level, iterations=1)
+            monster = unnamed_monster(
+                self.player.rng, self.player.level, iterations=1
+            )
             caption = "Placate " + definite(monster.name, 2)
         else:
             raise AssertionError
@@ -681,7 +1211,7 @@ class Simulation:
             self.player.queue.append(task)
             self.dequeue()
 
-        choice = random.below(3)
+        choice = self.player.rng.below(3)
         if choice == 0:
             enqueue(
                 RegularTask(
@@ -711,7 +1241,7 @@ class Simulation:
                 )
             )
 
-            nemesis = named_monster(self.player.level + 3)
+            nemesis = named_monster(self.player.rng, self.player.level + 3)
 
             enqueue(
                 RegularTask(
@@ -719,11 +1249,13 @@ class Simulation:
                 )
             )
 
-            s = random.below(3)
+            s = self.player.rng.below(3)
             for i in itertools.count(start=1):
-                if i > random.below(1 + self.player.quest_book.act + 1):
+                if i > self.player.rng.below(
+                    1 + self.player.quest_book.act + 1
+                ):
                     break
-                s += 1 + random.below(2)
+                s += 1 + self.player.rng.below(2)
                 if s % 3 == 0:
                     enqueue(
                         RegularTask(
@@ -760,7 +1292,7 @@ class Simulation:
             )
 
         elif choice == 2:
-            nemesis = impressive_guy()
+            nemesis = impressive_guy(self.player.rng)
             enqueue(
                 RegularTask(
                     "Oh sweet relief! "
@@ -777,7 +1309,7 @@ class Simulation:
             )
             enqueue(
                 RegularTask(
-                    f"You forget your {boring_item()} and go back to get it",
+                    f"You forget your {boring_item(self.player.rng)} and go back to get it",
                     2000,
                 )
             )
@@ -807,97 +1339,201 @@ class Simulation:
         )
 
 
-def special_item() -> str:
-    return interesting_item() + " of " + T.cast(str, random.choice(ITEM_OFS))
+def below_low(rng: random.Generator, num: int) -> int:
+    if rng.legacy:
+        return rng.below_low_pair(num)
+    return rng.below_low(num)
 
 
-def interesting_item() -> str:
+def special_item(rng: random.Generator) -> str:
+    return interesting_item(rng) + " of " + T.cast(str, rng.choice(ITEM_OFS))
+
+
+def interesting_item(rng: random.Generator) -> str:
     return (
-        T.cast(str, random.choice(ITEM_ATTRIB))
+        T.cast(str, rng.choice(ITEM_ATTRIB))
         + " "
-        + T.cast(str, random.choice(SPECIALS))
+        + T.cast(str, rng.choice(SPECIALS))
     )
 
 
-def boring_item() -> str:
-    return T.cast(str, random.choice(BORING_ITEMS))
+def boring_item(rng: random.Generator) -> str:
+    return T.cast(str, rng.choice(BORING_ITEMS))
 
 
-def impressive_guy() -> str:
-    return T.cast(str, random.choice(IMPRESSIVE_TITLES)) + (
-        " of the " + T.cast(Race, random.choice(RACES)).name
-        if random.below(2)
-        else " of " + generate_name()
+def impressive_guy(rng: random.Generator) -> str:
+    return T.cast(str, rng.choice(IMPRESSIVE_TITLES)) + (
+        " of the " + T.cast(Race, rng.choice(RACES)).name
+        if rng.below(2)
+        else " of " + generate_name(rng)
     )
 
 
-def unnamed_monster(level: int, iterations: int) -> Monster:
-    result = T.cast(Monster, random.choice(MONSTERS))
+class ClosestPicker(T.Generic[_T]):
+    # picks one of `items` like drawing 1 + `iterations` of them uniformly
+    # and keeping the first one whose key is closest to the goal, but with a
+    # single draw against a precomputed table.
+    #
+    # if k draws are made and c(d) of the M items are within distance d of the
+    # goal, the closest draw is further than d with probability
+    # (1 - c(d) / M) ** k. the first draw to reach the closest distance is
+    # equally likely to be any of the items at that distance.
+
+    def __init__(self, items: T.Sequence[_T], key: T.Callable[[_T], int]):
+        self._items = sorted(items, key=key)
+        self._keys = [key(item) for item in self._items]
+        self._tables: T.Dict[
+            T.Tuple[int, int], T.Tuple[T.List[float], T.List[_T]]
+        ] = {}
+
+    def pick(self, rng: random.Generator, goal: int, iterations: int) -> _T:
+        # past either end of the keys, the order of distances stays the same
+        goal = min(max(goal, self._keys[0]), self._keys[-1])
+        table = self._tables.get((goal, iterations))
+        if table is None:
+            table = self._tables[goal, iterations] = self._build_table(
+                goal, iterations
+            )
+        cumulative, items = table
+        return items[bisect.bisect_right(cumulative, rng.fraction())]
+
+    def _build_table(
+        self, goal: int, iterations: int
+    ) -> T.Tuple[T.List[float], T.List[_T]]:
+        total = len(self._items)
+        draws = 1 + iterations
+        by_distance = sorted(
+            zip(self._keys, self._items), key=lambda kv: abs(kv[0] - goal)
+        )
+
+        cumulative: T.List[float] = []
+        items: T.List[_T] = []
+        for _distance, group in itertools.groupby(
+            by_distance, key=lambda kv: abs(kv[0] - goal)
+        ):
+            members = [item for _key, item in group]
+            low = 1 - (1 - len(items) / total) ** draws
+            high = 1 - (1 - (len(items) + len(members)) / total) ** draws
+            for i, item in enumerate(members, start=1):
+                cumulative.append(low + (high - low) * i / len(members))
+                items.append(item)
+        cumulative[-1] = 1.0
+        return cumulative, items
+
+
+MONSTER_PICKER = ClosestPicker(MONSTERS, key=lambda monster: monster.level)
+EQUIPMENT_PICKERS = {
+    id(source): ClosestPicker(source, key=lambda preset: preset.quality)
+    for source in (WEAPONS, ARMORS, SHIELDS)
+}
+
+
+LOOT_NAMES = {
+    id(monster): f"{monster.name} {monster.item}".lower()
+    for monster in MONSTERS
+    if monster.item
+}
+
+
+def loot_name(monster: Monster) -> str:
+    name = LOOT_NAMES.get(id(monster))
+    if name is None:
+        name = f"{monster.name} {monster.item}".lower()
+    return name
+
+
+def unnamed_monster(
+    rng: random.Generator, level: int, iterations: int
+) -> Monster:
+    if not rng.legacy:
+        return MONSTER_PICKER.pick(rng, level, iterations)
+    result = T.cast(Monster, rng.choice(MONSTERS))
     for _ in range(iterations):
-        alternative = T.cast(Monster, random.choice(MONSTERS))
+        alternative = T.cast(Monster, rng.choice(MONSTERS))
         if abs(level - alternative.level) < abs(level - result.level):
             result = alternative
     return result
 
 
-def named_monster(level: int) -> str:
-    monster = unnamed_monster(level, iterations=4)
-    return generate_name() + " the " + monster.name
+def named_monster(rng: random.Generator, level: int) -> str:
+    monster = unnamed_monster(rng, level, iterations=4)
+    return generate_name(rng) + " the " + monster.name
 
 
 def pick_equipment(
-    source: T.List[EquipmentPreset], goal: int
+    rng: random.Generator, source: T.List[EquipmentPreset], goal: int
 ) -> EquipmentPreset:
-    result = T.cast(EquipmentPreset, random.choice(source))
+    picker = EQUIPMENT_PICKERS.get(id(source))
+    if picker is not None and not rng.legacy:
+        return picker.pick(rng, goal, iterations=5)
+    result = T.cast(EquipmentPreset, rng.choice(source))
     for _ in range(5):
-        alternative = T.cast(EquipmentPreset, random.choice(source))
+        alternative = T.cast(EquipmentPreset, rng.choice(source))
         if abs(goal - alternative.quality) < abs(goal - result.quality):
             result = alternative
     return result
 
 
+# each of the `steps` steps of the level drift moves one level up with 1/5
+# chance, one level down with 1/5 chance and stays put otherwise. that is
+# the same as the difference of two coin flips that each land with this
+# probability, so the whole walk is the difference of two binomials.
+DRIFT_PROBABILITY = (5 - math.sqrt(5)) / 10
+
+
+def level_drift(rng: random.Generator, steps: int) -> int:
+    if rng.legacy:
+        drift = 0
+        for _ in range(steps):
+            if rng.odds(2, 5):
+                drift += rng.below(2) * 2 - 1
+        return drift
+    return rng.binomial(steps, DRIFT_PROBABILITY) - rng.binomial(
+        steps, DRIFT_PROBABILITY
+    )
+
+
 def monster_task(
-    player_level: int, quest_monster: T.Optional[Monster]
+    rng: random.Generator,
+    player_level: int,
+    quest_monster: T.Optional[Monster],
 ) -> KillTask:
-    level = player_level
-    for _ in range(level):
-        if random.odds(2, 5):
-            level += random.below(2) * 2 - 1
+    level = player_level + level_drift(rng, player_level)
     if level < 1:
         level = 1
 
     is_definite = False
     monster: T.Optional[Monster] = None
-    if random.odds(1, 25):
+    if rng.odds(1, 25):
         # use an NPC every once in a while
-        race = random.choice(RACES)
-        if random.odds(1, 2):
-            result = "passing " + race.name + " " + random.choice(CLASSES).name
+        race = rng.choice(RACES)
+        if rng.odds(1, 2):
+            result = "passing " + race.name + " " + rng.choice(CLASSES).name
         else:
             result = (
-                random.choice_low(TITLES)
+                TITLES[below_low(rng, len(TITLES))]
                 + " "
-                + generate_name()
+                + generate_name(rng)
                 + " the "
                 + race.name
             )
             is_definite = True
         lev = level
-    elif quest_monster and random.odds(1, 4):
+    elif quest_monster and rng.odds(1, 4):
         # use the quest monster
         monster = quest_monster
         result = monster.name
         lev = monster.level
     else:
         # pick the monster out of so many random ones closest to the level we want
-        monster = unnamed_monster(level, iterations=5)
+        monster = unnamed_monster(rng, level, iterations=5)
         result = monster.name
         lev = monster.level
 
     qty = 1
     if level - lev > 10:
         # lev is too low. multiply
-        qty = (level + random.below(max(lev, 1))) // max(lev, 1)
+        qty = (level + rng.below(max(lev, 1))) // max(lev, 1)
         if qty < 1:
             qty = 1
         level //= qty
@@ -906,9 +1542,9 @@ def monster_task(
         result = "imaginary " + result
     elif level - lev < -5:
         i = 10 + level - lev
-        i = 5 - random.below(i + 1)
+        i = 5 - rng.below(i + 1)
         result = sick(i, young(lev - level - i, result))
-    elif level - lev < 0 and random.below(2) == 1:
+    elif level - lev < 0 and rng.below(2) == 1:
         result = sick(level - lev, result)
     elif level - lev < 0:
         result = young(level - lev, result)
@@ -916,9 +1552,9 @@ def monster_task(
         result = "messianic " + result
     elif level - lev > 5:
         i = 10 - (level - lev)
-        i = 5 - random.below(i + 1)
+        i = 5 - rng.below(i + 1)
         result = big(i, special(level - lev - i, result))
-    elif level - lev > 0 and random.below(2) == 1:
+    elif level - lev > 0 and rng.below(2) == 1:
         result = big(level - lev, result)
     elif level - lev > 0:
         result = special(level - lev, result)
@@ -932,20 +1568,69 @@ def monster_task(
     return KillTask(f"Executing {result}", duration, monster=monster)
 
 
+def expected_kill_duration(player_level: int) -> float:
+    # milliseconds that monster_task's kills take on average. a kill takes 6
+    # seconds per level of the monster and player level, whichever monster it
+    # is, and the level drift averages out to nothing, except that a level
+    # below 1 counts as 1; only the walk down all the way gets there, with
+    # (1/5) ** steps chance, and ends at 0
+    return 6000 * (player_level + 0.2**player_level) / player_level
+
+
+def _time_per_kill_second(player: Player) -> float:
+    # milliseconds of game time that pass for every second of killing, which
+    # is what the exp, quest and plot bars count: a full inventory takes a
+    # kill per item, then a trip to the market, selling every item, which
+    # are as many kinds at most, and a trip back
+    capacity = max(player.inventory.encum_bar.max_, 1)
+    killing = capacity * expected_kill_duration(player.level)
+    return (
+        1000
+        * (killing + 2 * MARKET_TRIP_DURATION + capacity * SELL_DURATION)
+        / killing
+    )
+
+
+def expected_time_left(player: Player, bar: Bar) -> T.Optional[float]:
+    # milliseconds of game time that the player's exp, quest, plot or
+    # encumbrance bar can be expected to take to fill up, or None when it
+    # does not fill on its own for now
+    quest_book = player.quest_book
+    if bar is player.inventory.encum_bar:
+        return (bar.max_ - bar.position) * expected_kill_duration(player.level)
+    if bar is quest_book.plot_bar and quest_book.act == 0:
+        # the prologue is a fixed list of tasks
+        if player.task is None:
+            return None
+        return (
+            player.task_bar.max_
+            - player.task_bar.position
+            + sum(task.duration for task in player.queue)
+        )
+    if bar is quest_book.quest_bar and quest_book.act == 0:
+        return None
+    if bar not in (player.exp_bar, quest_book.quest_bar, quest_book.plot_bar):
+        raise ValueError("no estimate for this bar")
+    return (bar.max_ - bar.position) * _time_per_kill_second(player)
+
+
 class StatsBuilder:
-    def __init__(self) -> None:
+    def __init__(
+        self, rng: random.Generator = random.default_generator
+    ) -> None:
+        self.rng = rng
         self.history: T.List[Stats] = []
 
     def roll(self) -> Stats:
         values: T.Dict[StatType, int] = {
-            stat: 3 + random.below(6) + random.below(6) + random.below(6)
+            stat: 3 + self.rng.below(6) + self.rng.below(6) + self.rng.below(6)
             for stat in PRIME_STATS
         }
         values[StatType.hp_max] = (
-            random.below(8) + values[StatType.condition] // 6
+            self.rng.below(8) + values[StatType.condition] // 6
         )
         values[StatType.mp_max] = (
-            random.below(8) + values[StatType.intelligence] // 6
+            self.rng.below(8) + values[StatType.intelligence] // 6
         )
         stats = Stats(values)
         self.history.append(stats)
@@ -958,11 +1643,19 @@ class StatsBuilder:
 
 
 def create_player(
-    name: str, race: Race, class_: Class, stats: Stats
+    name: str,
+    race: Race,
+    class_: Class,
+    stats: Stats,
+    rng: T.Optional[random.Generator] = None,
 ) -> Player:
     now = datetime.datetime.now()
-    random.seed(str(now))
     player = Player(
-        birthday=now, name=name, race=race, class_=class_, stats=stats
+        birthday=now,
+        name=name,
+        race=race,
+        class_=class_,
+        stats=stats,
+        rng=rng or random.Generator(str(now)),
     )
     return player
@@ -0,0 +1,111 @@
+import contextlib
+import cProfile
+import linecache
+import signal
+import sys
+import tracemalloc
+import typing as T
+from pathlib import Path
+
+
+class Profiler:
+    # runs cProfile and writes its statistics to `path`, keeping the profile
+    # running afterwards so that it can be written again later
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self._profile.enable()
+
+    def stop(self) -> None:
+        self._profile.disable()
+
+    def dump(self) -> None:
+        self._profile.dump_stats(str(self.path))
+        self._profile.enable()
+
+
+class AllocationTracer:
+    # traces memory allocations and reports the `limit` source lines that
+    # hold the most memory
+    def __init__(self, limit: int, path: T.Optional[Path] = None) -> None:
+        self.limit = limit
+        self.path = path
+
+    def start(self) -> None:
+        tracemalloc.start()
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+
+    def report(self) -> str:
+        # leave out the memory that profiling and reporting take themselves
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            [
+                tracemalloc.Filter(False, module.__file__)
+                for module in (cProfile, linecache, tracemalloc)
+            ]
+        )
+        stats = snapshot.statistics("lineno")
+        lines = [
+            f"top {min(self.limit, len(stats))} of {len(stats)} allocation "
+            f"sites, {sum(stat.size for stat in stats) / 1024:.1f} KiB "
+            "in total:"
+        ]
+        for i, stat in enumerate(stats[: self.limit], start=1):
+            frame = stat.traceback[0]
+            lines.append(
+                f"#{i}: {frame.filename}:{frame.lineno}: "
+                f"{stat.size / 1024:.1f} KiB in {stat.count} blocks"
+            )
+            source = linecache.getline(frame.filename, frame.lineno).strip()
+            if source:
+                lines.append(f"    {source}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self) -> None:
+        report = self.report()
+        if self.path is None:
+            sys.stderr.write(report)
+            sys.stderr.flush()
+        else:
+            self.path.write_text(report)
+
+
+@contextlib.contextmanager
+def profiling(
+    profile_path: T.Optional[Path] = None,
+    malloc_limit: T.Optional[int] = None,
+    malloc_path: T.Optional[Path] = None,
+) -> T.Iterator[None]:
+    # profiles and traces whatever runs inside, writing the results when it
+    # ends however it ends, and whenever the process is sent SIGUSR1
+    tools: T.List[T.Union[Profiler, AllocationTracer]] = []
+    if malloc_limit is not None:
+        tools.append(AllocationTracer(malloc_limit, malloc_path))
+    if profile_path is not None:
+        tools.append(Profiler(profile_path))
+    if not tools:
+        yield
+        return
+
+    def dump() -> None:
+        for tool in tools:
+            tool.dump()
+
+    previous_handler = None
+    if hasattr(signal, "SIGUSR1"):
+        previous_handler = signal.signal(
+            signal.SIGUSR1, lambda _signum, _frame: dump()
+        )
+    for tool in tools:
+        tool.start()
+    try:
+        yield
+    finally:
+        dump()
+        for tool in reversed(tools):
+            tool.stop()
+        if previous_handler is not None:
+            signal.signal(signal.SIGUSR1, previous_handler)
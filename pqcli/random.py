@@ -1,26 +1,316 @@
+import array
+import functools
+import hashlib
+import math
 import random
 import typing as T
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
-def seed(source: str) -> None:
-    random.seed(source.encode())
 
+class AliasTable:
+    # Walker's alias method: picks index i with probability weights[i] /
+    # sum(weights) with one uniform draw and constant work. each of the
+    # columns is either its own index or its alias, split at probs[i].
 
-def choice(source: T.Sequence[T.Any]) -> T.Any:
-    return source[below(len(source))]
+    def __init__(self, weights: T.Sequence[float]) -> None:
+        num = len(weights)
+        total = sum(weights)
+        scaled = [weight * num / total for weight in weights]
+        self.probs = [1.0] * num
+        self.aliases = list(range(num))
+        small = [i for i, weight in enumerate(scaled) if weight < 1.0]
+        large = [i for i, weight in enumerate(scaled) if weight >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.probs[less] = scaled[less]
+            self.aliases[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        # whatever is left is 1.0 up to rounding errors
 
+    def __len__(self) -> int:
+        return len(self.probs)
 
-def choice_low(source: T.Sequence[T.Any]) -> T.Any:
-    return source[below_low(len(source))]
+    def draw(self, fraction: float) -> int:
+        # `fraction` picks the column with its whole part and which side of
+        # the split with what is left
+        column, split = divmod(fraction * len(self.probs), 1.0)
+        idx = int(column)
+        return idx if split < self.probs[idx] else self.aliases[idx]
 
 
-def below(num: int) -> int:
-    return random.randint(0, num - 1)
+@functools.lru_cache(maxsize=64)
+def low_table(num: int) -> AliasTable:
+    # the lower of two draws below num is k with chance
+    # ((num - k) ** 2 - (num - k - 1) ** 2) / num ** 2
+    return AliasTable([2 * (num - k) - 1 for k in range(num)])
 
 
-def below_low(num: int) -> int:
-    return min(below(num), below(num))
+class Generator:
+    # the helpers the game draws its random numbers with, over a stream of
+    # their own. each character owns one, so that characters don't disturb
+    # each other and a run can be replayed from the same seed.
+    #
+    # a legacy generator asks the game to draw its numbers in the exact order
+    # of the original game, so that seeded runs of it replay the same way,
+    # instead of using the faster equivalent samplers. it is saved along with
+    # the generator, so a character keeps its mode.
 
+    __slots__ = ("_random", "legacy")
 
-def odds(chance: int, out_of: int) -> bool:
-    return below(out_of) < chance
+    def __init__(
+        self, source: T.Optional[str] = None, legacy: bool = False
+    ) -> None:
+        self._random = random.Random()
+        self.legacy = legacy
+        if source is not None:
+            self.seed(source)
+
+    def __getstate__(self) -> T.Dict[str, T.Any]:
+        return {"_random": self._random, "legacy": self.legacy}
+
+    def __setstate__(self, state: T.Dict[str, T.Any]) -> None:
+        self._random = state["_random"]
+        # saves made before there was a legacy mode draw the faster way
+        self.legacy = state.get("legacy", False)
+
+    def seed(self, source: str) -> None:
+        self._random.seed(source.encode())
+
+    def choice(self, source: T.Sequence[T.Any]) -> T.Any:
+        return source[self.below(len(source))]
+
+    def choice_low(self, source: T.Sequence[T.Any]) -> T.Any:
+        return source[self.below_low(len(source))]
+
+    def below(self, num: int) -> int:
+        return self._random.randint(0, num - 1)
+
+    def below_low(self, num: int) -> int:
+        # distributed like the lower of two draws below num, with one draw
+        return low_table(num).draw(self.fraction())
+
+    def below_low_pair(self, num: int) -> int:
+        # the lower of two draws below num, as the original game draws it
+        return min(self.below(num), self.below(num))
+
+    def odds(self, chance: int, out_of: int) -> bool:
+        return self.below(out_of) < chance
+
+    def fraction(self) -> float:
+        return self._random.random()
+
+    def binomial(self, num: int, prob: float) -> int:
+        # number of successes in `num` trials of probability `prob`, drawn in
+        # constant expected time. this is the algorithm of Python 3.12's
+        # random.binomialvariate, kept here so that all supported versions draw
+        # the same sequence.
+        if prob <= 0.0 or num <= 0:
+            return 0
+        if prob >= 1.0:
+            return num
+        if prob > 0.5:
+            return num - self.binomial(num, 1.0 - prob)
+
+        if num * prob < 10.0:
+            # BG: geometric method by Devroye, O(num * prob)
+            successes = trials = 0
+            c = math.log(1.0 - prob)
+            if not c:
+                return successes
+            while True:
+                trials += math.floor(math.log(self.fraction()) / c) + 1
+                if trials > num:
+                    return successes
+                successes += 1
+
+        # BTRS: transformed rejection with squeeze by Wolfgang Hörmann
+        spq = math.sqrt(num * prob * (1.0 - prob))
+        b = 1.15 + 2.53 * spq
+        a = -0.0873 + 0.0248 * b + 0.01 * prob
+        c = num * prob + 0.5
+        vr = 0.92 - 4.2 / b
+        alpha = (2.83 + 5.1 / b) * spq
+        lpq = math.log(prob / (1.0 - prob))
+        m = math.floor((num + 1) * prob)
+        h = math.lgamma(m + 1) + math.lgamma(num - m + 1)
+
+        while True:
+            u = self.fraction() - 0.5
+            us = 0.5 - abs(u)
+            k = math.floor((2.0 * a / us + b) * u + c)
+            if k < 0 or k > num:
+                continue
+
+            v = self.fraction()
+            if us >= 0.07 and v <= vr:
+                return k
+
+            v *= alpha / (a / (us * us) + b)
+            if (
+                math.log(v)
+                <= h
+                - math.lgamma(k + 1)
+                - math.lgamma(num - k + 1)
+                + (k - m) * lpq
+            ):
+                return k
+
+
+_SPAN = 2**53
+
+
+class BufferedGenerator(Generator):
+    # draws its numbers from blocks of uniform fractions made ahead of time,
+    # so that each draw is a pop from an array rather than a trip through
+    # random.randint. the blocks come from NumPy when it is installed and
+    # from one large getrandbits call otherwise. draws follow a different
+    # sequence than Generator for the same seed.
+    #
+    # saves hold the state the current block was made from and how much of
+    # it is left rather than the block itself, and make it again on load.
+
+    block_size = 1024
+
+    def __init__(
+        self, source: T.Optional[str] = None, legacy: bool = False
+    ) -> None:
+        self._buffer = array.array("d")
+        self._block_start: T.Any = None
+        self._numpy: T.Any = None
+        if numpy is not None:
+            self._numpy = numpy.random.Generator(numpy.random.PCG64())
+        super().__init__(source, legacy)
+
+    def __getstate__(self) -> T.Dict[str, T.Any]:
+        state = {
+            "numpy": (
+                self._numpy.bit_generator.state
+                if self._numpy is not None
+                else None
+            ),
+            "block_start": self._block_start,
+            "remaining": len(self._buffer),
+            "legacy": self.legacy,
+        }
+        if self._numpy is None and self._block_start is None:
+            # otherwise the state at the start of the block is all it takes
+            state["random"] = self._random
+        return state
+
+    def __setstate__(self, state: T.Dict[str, T.Any]) -> None:
+        self._random = state.get("random") or random.Random()
+        self.legacy = state.get("legacy", False)
+        self._buffer = array.array("d")
+        self._block_start = None
+        self._numpy = None
+        if state["numpy"] is not None:
+            if numpy is None:
+                # saved where NumPy was installed; go on with new blocks from
+                # getrandbits
+                return
+            bit_generator = numpy.random.PCG64()
+            bit_generator.state = state["numpy"]
+            self._numpy = numpy.random.Generator(bit_generator)
+        if state["block_start"] is not None:
+            self._restore(state["block_start"])
+            self._refill()
+            del self._buffer[state["remaining"] :]
+
+    def seed(self, source: str) -> None:
+        super().seed(source)
+        self._buffer = array.array("d")
+        self._block_start = None
+        if self._numpy is not None:
+            self._numpy = numpy.random.Generator(
+                numpy.random.PCG64(
+                    int.from_bytes(
+                        hashlib.sha256(source.encode()).digest(), "little"
+                    )
+                )
+            )
+
+    def below(self, num: int) -> int:
+        # every fraction is a whole number of 2 ** -53, so it carries 53 bits
+        # to take the remainder of; numbers from the top of the range that
+        # would favour the low remainders are drawn again, which happens with
+        # less than num / 2 ** 53 chance
+        if 0 < num <= _SPAN:
+            buffer = self._buffer or self._refill()
+            value = int(buffer.pop() * _SPAN)
+            if value < _SPAN - _SPAN % num:
+                return value % num
+        return self._below_wide(num)
+
+    def _below_wide(self, num: int) -> int:
+        # the same for any range, taking as many fractions as it needs
+        if num <= 0:
+            raise ValueError(f"empty range for below({num})")
+        words = -(-num.bit_length() // 53)
+        span = 1 << (53 * words)
+        limit = span - span % num
+        while True:
+            value = 0
+            for _ in range(words):
+                buffer = self._buffer or self._refill()
+                value = (value << 53) | int(buffer.pop() * _SPAN)
+            if value < limit:
+                return value % num
+
+    def fraction(self) -> float:
+        buffer = self._buffer or self._refill()
+        return buffer.pop()
+
+    def _restore(self, block_start: T.Any) -> None:
+        if self._numpy is not None:
+            self._numpy.bit_generator.state = block_start
+        else:
+            self._random.setstate(block_start)
+
+    def _refill(self) -> "array.array[float]":
+        if self._numpy is not None:
+            self._block_start = self._numpy.bit_generator.state
+            self._buffer = array.array(
+                "d", self._numpy.random(self.block_size).tobytes()
+            )
+        else:
+            self._block_start = self._random.getstate()
+            # 53 random bits for each fraction, like random.random()
+            words = array.array("Q")
+            words.frombytes(
+                self._random.getrandbits(64 * self.block_size).to_bytes(
+                    8 * self.block_size, "little"
+                )
+            )
+            self._buffer = array.array(
+                "d", [(word >> 11) * 2.0**-53 for word in words]
+            )
+        return self._buffer
+
+
+# the generators a character can be given, by the name they are chosen with
+BACKENDS: T.Dict[str, T.Type[Generator]] = {
+    "standard": Generator,
+    "buffered": BufferedGenerator,
+}
+
+# for everything that isn't tied to a character, like rolling a new one
+default_generator = Generator()
+
+seed = default_generator.seed
+choice = default_generator.choice
+choice_low = default_generator.choice_low
+below = default_generator.below
+below_low = default_generator.below_low
+below_low_pair = default_generator.below_low_pair
+odds = default_generator.odds
+fraction = default_generator.fraction
+binomial = default_generator.binomial
@@ -12,6 +12,9 @@ class Roster:
         self.path = path
         self.players = players
         self._last_save = datetime.now()
+        # the characters being played, whose game time is up to date
+        # whenever the roster is saved
+        self._played: T.List[Player] = []
 
     @staticmethod
     def load(path: T.Union[str, Path]) -> "Roster":
@@ -24,6 +27,8 @@ class Roster:
 
     def save(self) -> None:
         self._last_save = datetime.now()
+        for player in self._played:
+            player.last_save = self._last_save
         old_path = self.path.with_name(self.path.name + ".old")
         tmp_path = self.path.with_name(self.path.name + ".new")
         tmp_path.parent.mkdir(parents=True, exist_ok=True)
@@ -34,6 +39,18 @@ class Roster:
             self.path.rename(old_path)
         tmp_path.rename(self.path)
 
+    def play(self, player: Player) -> None:
+        if not any(played is player for played in self._played):
+            self._played.append(player)
+
+    def leave(self, player: Player) -> None:
+        # the character's offline time starts now, and later saves keep it
+        if any(played is player for played in self._played):
+            player.last_save = datetime.now()
+            self._played = [
+                played for played in self._played if played is not player
+            ]
+
     def save_periodically(self) -> None:
         if (datetime.now() - self._last_save).total_seconds() >= 300:
             logging.info("Saving...")
@@ -0,0 +1,95 @@
+import json
+import typing as T
+from collections import Counter
+from pathlib import Path
+
+from pqcli import mechanic
+from pqcli.mechanic import SignalMixin
+
+# upper bounds of the latency buckets, in microseconds; the last bucket takes
+# everything slower
+BUCKETS_US = tuple(2**i for i in range(21))
+
+
+class Histogram:
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS_US) + 1)
+        self.calls = 0
+        self.total = 0.0
+
+    def add(self, seconds: float) -> None:
+        # bucket i holds latencies below 2**i us, so the bit length of the
+        # whole microseconds is the bucket
+        self.counts[min(int(seconds * 1e6).bit_length(), len(BUCKETS_US))] += 1
+        self.calls += 1
+        self.total += seconds
+
+    def to_dict(self) -> T.Dict[str, T.Any]:
+        return {
+            "calls": self.calls,
+            "total_ms": self.total * 1000,
+            "buckets_us": list(BUCKETS_US),
+            "counts": self.counts,
+        }
+
+
+class SignalStats:
+    def __init__(self) -> None:
+        # listener calls by emitting class and signal name
+        self.signals: T.Counter[T.Tuple[str, str]] = Counter()
+        self.callbacks: T.Dict[str, Histogram] = {}
+
+    def add(
+        self,
+        source: SignalMixin,
+        signal_name: str,
+        callback: T.Callable[..., T.Any],
+        seconds: float,
+    ) -> None:
+        self.signals[type(source).__name__, signal_name] += 1
+        name = getattr(callback, "__qualname__", repr(callback))
+        histogram = self.callbacks.get(name)
+        if histogram is None:
+            histogram = self.callbacks[name] = Histogram()
+        histogram.add(seconds)
+
+    def to_dict(self) -> T.Dict[str, T.Any]:
+        return {
+            "signals": [
+                {"class": key[0], "signal": key[1], "calls": count}
+                for key, count in self.signals.most_common()
+            ],
+            "callbacks": [
+                {"callback": name, **histogram.to_dict()}
+                for name, histogram in sorted(
+                    self.callbacks.items(),
+                    key=lambda item: item[1].total,
+                    reverse=True,
+                )
+            ],
+        }
+
+    def dump(self, path: Path) -> None:
+        path.write_text(json.dumps(self.to_dict(), indent=4) + "\n")
+
+
+_stats: T.Optional[SignalStats] = None
+
+
+def enable() -> SignalStats:
+    global _stats
+    if _stats is None:
+        _stats = SignalStats()
+        mechanic.listener_timer = _stats.add
+    return _stats
+
+
+def disable() -> None:
+    global _stats
+    mechanic.listener_timer = None
+    _stats = None
+
+
+def dump(path: Path) -> None:
+    if _stats is not None:
+        _stats.dump(path)
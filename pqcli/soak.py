@@ -0,0 +1,294 @@
+import argparse
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing as T
+from dataclasses import dataclass
+from pathlib import Path
+
+from pqcli import random
+from pqcli.bench import fake_screen, make_player
+from pqcli.mechanic import (
+    EQUIPMENT_PICKERS,
+    MONSTER_PICKER,
+    Player,
+    QuestBook,
+    Simulation,
+)
+from pqcli.roster import Roster
+
+MODES = ["headless", "curses"]
+
+HOUR = 60 * 60 * 1000
+
+# the first samples are taken while the character still fills its inventory,
+# spell book and caches, so growth is only measured from this share of the
+# run on
+WARM_UP = 0.1
+
+# a character finishes more than 900 tasks per hour of game time at every
+# level, so keeping even the smallest object (a float) for each task grows by
+# about 21 KiB per hour. traced memory may grow by a quarter of that
+TASKS_PER_HOUR = 900
+MAX_GROWTH = TASKS_PER_HOUR * sys.getsizeof(0.0) / 4 / 1024
+
+# the quest log fills up over the first days of play, and the quest window
+# with it; a caption takes less than 100 bytes in each, so traced memory may
+# grow by that much more however short the run
+TRACED_ALLOWANCE = 2 * QuestBook.log_size * 100 / 1024
+
+# the resident set grows in whole allocator arenas of up to 1 MiB, so however
+# long the run, it may grow by one of them more than traced memory may
+RSS_ALLOWANCE = 1024
+
+
+@dataclass
+class Sample:
+    ticks: int
+    elapsed: float
+    level: int
+    rss: int
+    traced: int
+    connections: int
+
+
+def rss() -> int:
+    # resident set size in bytes; where /proc is missing, the peak will do
+    try:
+        with open("/proc/self/statm") as handle:
+            pages = int(handle.read().split()[1])
+        return pages * resource.getpagesize()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def connections(player: Player) -> int:
+    return sum(
+        len(refs)
+        for source in player.signal_sources
+        for refs in (source._connections or {}).values()
+    )
+
+
+def clear_caches() -> None:
+    # the game keeps tables for the levels and qualities it draws against.
+    # they are bounded, but fill as the character levels up, so they are
+    # emptied before each measurement to leave only what the character holds
+    random.low_table.cache_clear()
+    for picker in (MONSTER_PICKER, *EQUIPMENT_PICKERS.values()):
+        picker._tables.clear()
+
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    # leaves out what tracing and the samples taken so far take themselves
+    return tracemalloc.take_snapshot().filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+    )
+
+
+def growth_per_hour(first: Sample, last: Sample, field: str) -> float:
+    hours = (last.elapsed - first.elapsed) / HOUR
+    if hours <= 0:
+        return 0.0
+    return (getattr(last, field) - getattr(first, field)) / hours
+
+
+def soak(
+    player: Player, ticks: int, tick: float, samples: int
+) -> T.Tuple[T.List[Sample], tracemalloc.Snapshot, tracemalloc.Snapshot]:
+    # runs `ticks` regular ticks of `tick` milliseconds and takes `samples`
+    # samples on the way; returns them with the memory snapshots taken at the
+    # end of the warm-up and at the end of the run
+    simulation = Simulation(player)
+    interval = max(ticks // samples, 1)
+    warm_up = int(ticks * WARM_UP)
+    result: T.List[Sample] = []
+    first_snapshot: T.Optional[tracemalloc.Snapshot] = None
+
+    tracemalloc.start()
+    try:
+        done = 0
+        while done < ticks:
+            batch = min(interval, ticks - done)
+            for _ in range(batch):
+                simulation.tick(tick)
+            done += batch
+            clear_caches()
+            snapshot = take_snapshot()
+            sample = Sample(
+                ticks=done,
+                elapsed=player.elapsed,
+                level=player.level,
+                rss=rss(),
+                traced=sum(
+                    stat.size for stat in snapshot.statistics("filename")
+                ),
+                connections=connections(player),
+            )
+            result.append(sample)
+            print(
+                f"{done:>12,} ticks  level {sample.level:4d}  "
+                f"rss {sample.rss / 1024:10,.0f} KiB  "
+                f"traced {sample.traced / 1024:10,.0f} KiB  "
+                f"{sample.connections:4d} connections",
+                flush=True,
+            )
+            if first_snapshot is None and done >= warm_up:
+                first_snapshot = snapshot
+    finally:
+        tracemalloc.stop()
+    assert first_snapshot is not None
+    return result, first_snapshot, snapshot
+
+
+def growing_sites(
+    first: tracemalloc.Snapshot, last: tracemalloc.Snapshot, limit: int
+) -> T.List[tracemalloc.StatisticDiff]:
+    stats = last.compare_to(first, "lineno")
+    return [stat for stat in stats if stat.size_diff > 0][:limit]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="pqcli.soak",
+        description=(
+            "run a character for a long time and check that the memory it "
+            "takes stays flat"
+        ),
+    )
+    parser.add_argument(
+        "modes",
+        nargs="*",
+        metavar="MODE",
+        help=(
+            "headless, or curses to draw the game windows on a fake screen "
+            "(default: both)"
+        ),
+    )
+    parser.add_argument(
+        "-n",
+        "--ticks",
+        type=int,
+        default=10**7,
+        help="number of ticks to run (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--tick",
+        type=float,
+        default=100.0,
+        metavar="MS",
+        help="game time per tick in milliseconds (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-s",
+        "--samples",
+        type=int,
+        default=20,
+        help="number of samples to take (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-growth",
+        type=float,
+        default=MAX_GROWTH,
+        metavar="KIB",
+        help=(
+            "fail when traced memory grows by more than this per hour of "
+            "game time, on top of room for the quest log to fill up "
+            "(default: %(default).1f)"
+        ),
+    )
+    parser.add_argument(
+        "--rss-allowance",
+        type=float,
+        default=RSS_ALLOWANCE,
+        metavar="KIB",
+        help=(
+            "fail when the resident set grows by more than this on top of "
+            "--max-growth per hour (default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        metavar="N",
+        help="number of growing allocation sites to report",
+    )
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        if mode not in MODES:
+            parser.error(f"unknown mode: {mode}")
+
+    failed = False
+    for mode in args.modes or MODES:
+        print(f"{mode}:")
+        player = make_player(seed=f"soak-{mode}")
+        view: T.Any = None
+        with tempfile.TemporaryDirectory() as directory:
+            if mode == "curses":
+                from pqcli.ui.curses.views import GameView
+
+                view = GameView(
+                    fake_screen(),
+                    Roster(Path(directory) / "pq.dat", [player]),
+                    player,
+                    argparse.Namespace(cheats=False, use_saves=False),
+                )
+                view.start()
+            start = time.perf_counter()
+            samples, first_snapshot, last_snapshot = soak(
+                player, args.ticks, args.tick, args.samples
+            )
+            wall_time = time.perf_counter() - start
+            if view is not None:
+                view.stop()
+
+        first = next(
+            sample
+            for sample in samples
+            if sample.ticks >= int(args.ticks * WARM_UP)
+        )
+        last = samples[-1]
+        hours = (last.elapsed - first.elapsed) / HOUR
+        # both may grow by a fixed allowance, and then by --max-growth for
+        # each hour measured, so that the verdict does not depend on how
+        # long the run is
+        traced_growth = (last.traced - first.traced) / 1024
+        max_traced_growth = TRACED_ALLOWANCE + args.max_growth * hours
+        rss_growth = (last.rss - first.rss) / 1024
+        max_rss_growth = args.rss_allowance + args.max_growth * hours
+        print(
+            f"{hours:.0f} hours of game time measured in {wall_time:.0f}s: "
+            f"traced memory grows by {traced_growth:.1f} KiB of at most "
+            f"{max_traced_growth:.1f} KiB "
+            f"({growth_per_hour(first, last, 'traced') / 1024:.2f} KiB/hour), "
+            f"the resident set by {rss_growth:.0f} KiB of at most "
+            f"{max_rss_growth:.0f} KiB"
+        )
+        if last.connections > first.connections:
+            print(
+                f"signal connections grew from {first.connections} "
+                f"to {last.connections}"
+            )
+        print("top growing allocation sites:")
+        for stat in growing_sites(first_snapshot, last_snapshot, args.top):
+            frame = stat.traceback[0]
+            print(
+                f"  {frame.filename}:{frame.lineno}: "
+                f"+{stat.size_diff / 1024:.1f} KiB "
+                f"in {stat.count_diff:+d} blocks"
+            )
+        if traced_growth > max_traced_growth or rss_growth > max_rss_growth:
+            failed = True
+    if failed:
+        parser.exit(1, "memory grows\n")
+
+
+if __name__ == "__main__":
+    main()
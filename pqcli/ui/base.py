@@ -1,7 +1,9 @@
 import abc
 import argparse
+import datetime
 import typing as T
 
+from pqcli import random
 from pqcli.mechanic import Player
 from pqcli.roster import Roster
 
@@ -17,6 +19,14 @@ class BaseUserInterface(abc.ABC):
         self.args = args
         self.player = player
 
+    def new_generator(self) -> random.Generator:
+        # a random number generator of the kind chosen on the command line,
+        # for a new character
+        backend = random.BACKENDS[
+            getattr(self.args, "rng", None) or "standard"
+        ]
+        return backend(str(datetime.datetime.now()))
+
     @abc.abstractmethod
     def run(self) -> None:
         raise NotImplementedError("not implemented")
@@ -5,7 +5,7 @@ import signal
 import sys
 import time
 import typing as T
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from pqcli import lingo
 from pqcli.config import CLASSES, PRIME_STATS, RACES
@@ -22,6 +22,9 @@ LOGO = r"""
                  |___/
 """
 
+# milliseconds
+MAX_WAIT = 60 * 1000
+
 
 class MainMenu(enum.IntEnum):
     create = 1
@@ -120,7 +123,11 @@ class BasicUserInterface(BaseUserInterface):
                 break
 
         player = create_player(
-            name=name, race=race, class_=class_, stats=stats
+            name=name,
+            race=race,
+            class_=class_,
+            stats=stats,
+            rng=self.new_generator(),
         )
         self.roster.players.append(player)
         if auto_play and self.confirm(
@@ -131,21 +138,22 @@ class BasicUserInterface(BaseUserInterface):
 
     def play(self, player: Player) -> None:
         print(f"Playing as {player.name}")
+        self.roster.play(player)
         simulation = Simulation(player)
         last_tick = datetime.now()
         last_level = 0
         while True:
             elapsed = datetime.now() - last_tick
-            simulation.tick(elapsed.total_seconds() * 1000)
+            simulation.tick(elapsed.total_seconds() * 1000, carry=True)
             last_tick = datetime.now()
-            wait = (timedelta(milliseconds=100) - elapsed).total_seconds()
-            wait = max(0, wait)
-            time.sleep(wait)
             if player.level != last_level:
                 last_level = player.level
                 self.print_player_info(player)
             if self.args.use_saves:
                 self.roster.save_periodically()
+            # nothing is printed until a task is over, so sleep until then
+            wait = min(simulation.time_to_next_event(), MAX_WAIT)
+            time.sleep(wait / 1000)
 
     def print_player_info(self, player: Player) -> None:
         print("--- Character Sheet ---")
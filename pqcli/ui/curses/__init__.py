@@ -2,7 +2,6 @@ import argparse
 import curses
 import os
 import signal
-import time
 import typing as T
 
 from pqcli import lingo
@@ -45,7 +44,6 @@ class CursesUserInterface(BaseUserInterface):
         super().__init__(roster, player, args)
         os.environ.setdefault("ESCDELAY", "25")
         self._screen = curses.initscr()
-        self._screen.nodelay(True)
         self._screen.keypad(True)
         curses.noecho()
         curses.curs_set(0)
@@ -85,10 +83,10 @@ class CursesUserInterface(BaseUserInterface):
                 self._switch_to_roster_view()
 
             while True:
+                self._screen.timeout(self._view.idle_timeout())
                 key = T.cast(int, self._screen.getch())
 
                 if key == curses.ERR:
-                    time.sleep(0.1)
                     self._view.idle()
                     continue
 
@@ -177,7 +175,9 @@ class CursesUserInterface(BaseUserInterface):
         self._switch_view(view)
 
     def _switch_to_game_view(self, player: Player) -> None:
+        self.roster.play(player)
         view = GameView(self._screen, self.roster, player, self.args)
+        view.on_exit += lambda: self.roster.leave(player)
         view.on_exit += self._switch_to_roster_view
         self._switch_view(view)
 
@@ -189,7 +189,9 @@ class CursesUserInterface(BaseUserInterface):
     def _create_character(
         self, name: str, race: Race, class_: Class, stats: Stats
     ) -> None:
-        player = create_player(name, race, class_, stats)
+        player = create_player(
+            name, race, class_, stats, rng=self.new_generator()
+        )
         self.roster.players.append(player)
         if self.args.use_saves:
             self.roster.save()
@@ -14,5 +14,9 @@ class BaseView:
     def idle(self) -> None:
         pass
 
+    def idle_timeout(self) -> int:
+        # milliseconds to wait for a key before calling idle(), -1 to block
+        return -1
+
     def keypress(self, key: int) -> None:
         pass
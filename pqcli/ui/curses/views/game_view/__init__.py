@@ -3,7 +3,7 @@ import curses
 import datetime
 import typing as T
 
-from pqcli.mechanic import Player, SignalMixin, Simulation
+from pqcli.mechanic import Player, Simulation
 from pqcli.roster import Roster
 from pqcli.ui.curses.event_handler import EventHandler
 from pqcli.ui.curses.util import (
@@ -25,6 +25,9 @@ from .quest_book_window import QuestBookWindow
 from .spell_book_window import SpellBookWindow
 from .task_progress_window import TaskProgressWindow
 
+# milliseconds
+MIN_IDLE_TIMEOUT = 100
+
 
 class GameView(BaseView):
     def __init__(
@@ -112,17 +115,10 @@ class GameView(BaseView):
             self._simulation.tick()
 
         elif self._args.cheats and key == ord("T"):
-            for _ in range(100):
-                self._simulation.tick()
+            self._simulation.tick(100 * 100, carry=True)
 
         elif self._args.cheats and key == curses.ascii.DC4:  # ^t
-            old = SignalMixin.emit
-            SignalMixin.emit = lambda *_: None
-            for _ in range(10000):
-                self._simulation.tick()
-            SignalMixin.emit = old
-            for child in self._children:
-                child.sync()
+            self._simulation.advance(ticks=10000)
 
         else:
             super().keypress(key)
@@ -245,12 +241,20 @@ class GameView(BaseView):
 
     def idle(self) -> None:
         elapsed = datetime.datetime.now() - self._last_tick
-        self._simulation.tick(elapsed.total_seconds() * 1000)
+        self._simulation.tick(elapsed.total_seconds() * 1000, carry=True)
         self._last_tick = datetime.datetime.now()
         if self._args.use_saves:
             self._roster.save_periodically()
         curses.doupdate()
 
+    def idle_timeout(self) -> int:
+        # nothing on screen moves before the task bar fills another cell or
+        # the task is over, so there is no point waking up any earlier
+        timeout = self._simulation.time_to_next_change(
+            self._task_win.bar_width
+        )
+        return int(max(timeout, MIN_IDLE_TIMEOUT))
+
     @property
     def focused(self) -> Focusable:
         for widget in self._focusable_children:
@@ -1,6 +1,6 @@
 import typing as T
 
-from pqcli.mechanic import Player, StatType
+from pqcli.mechanic import Player, StatType, expected_time_left
 from pqcli.ui.curses.widgets import Focusable
 
 from .progress_bar_window import DataTableProgressBarWindow
@@ -28,6 +28,9 @@ class CharacterSheetWindow(Focusable, DataTableProgressBarWindow):
         self._player.connect("level_up", self._sync_traits)
         self._player.stats.connect("change", self._sync_traits)
         self._player.exp_bar.connect("change", self._sync_exp)
+        self._player.connect("sync", self.sync)
+        self._player.stats.connect("sync", self.sync)
+        self._player.exp_bar.connect("sync", self.sync)
 
         self.sync()
 
@@ -37,6 +40,9 @@ class CharacterSheetWindow(Focusable, DataTableProgressBarWindow):
         self._player.disconnect("level_up", self._sync_traits)
         self._player.stats.disconnect("change", self._sync_traits)
         self._player.exp_bar.disconnect("change", self._sync_exp)
+        self._player.disconnect("sync", self.sync)
+        self._player.stats.disconnect("sync", self.sync)
+        self._player.exp_bar.disconnect("sync", self.sync)
 
     def sync(self) -> None:
         self._sync_traits()
@@ -60,6 +66,9 @@ class CharacterSheetWindow(Focusable, DataTableProgressBarWindow):
     def _sync_exp(self) -> None:
         self._cur_pos = self._player.exp_bar.position
         self._max_pos = self._player.exp_bar.max_
+        self._time_left = expected_time_left(
+            self._player, self._player.exp_bar
+        )
         self._progress_title = (
             f"Experience ({self._max_pos-self._cur_pos:.0f} XP to go)"
         )
@@ -17,6 +17,7 @@ class EquipmentWindow(Focusable, WindowWrapper):
 
         self._player = player
         self._player.equipment.connect("change", self._sync_equipment_change)
+        self._player.equipment.connect("sync", self.sync)
 
         self.sync()
 
@@ -27,6 +28,7 @@ class EquipmentWindow(Focusable, WindowWrapper):
         self._player.equipment.disconnect(
             "change", self._sync_equipment_change
         )
+        self._player.equipment.disconnect("sync", self.sync)
 
     def sync(self) -> None:
         self._data_table.clear()
@@ -1,6 +1,6 @@
 import typing as T
 
-from pqcli.mechanic import InventoryItem, Player
+from pqcli.mechanic import InventoryItem, Player, expected_time_left
 from pqcli.ui.curses.widgets import Focusable
 
 from .progress_bar_window import DataTableProgressBarWindow
@@ -18,7 +18,7 @@ class InventoryWindow(Focusable, DataTableProgressBarWindow):
             x,
             " Inventory ",
             align_right=True,
-            show_time=False,
+            show_time=True,
         )
         self._on_focus_change += self._render
 
@@ -31,6 +31,8 @@ class InventoryWindow(Focusable, DataTableProgressBarWindow):
         self._player.inventory.encum_bar.connect(
             "change", self._sync_encumbrance
         )
+        self._player.inventory.connect("sync", self.sync)
+        self._player.inventory.encum_bar.connect("sync", self.sync)
 
         self.sync()
 
@@ -47,6 +49,8 @@ class InventoryWindow(Focusable, DataTableProgressBarWindow):
         self._player.inventory.encum_bar.disconnect(
             "change", self._sync_encumbrance
         )
+        self._player.inventory.disconnect("sync", self.sync)
+        self._player.inventory.encum_bar.disconnect("sync", self.sync)
 
     def scroll_page_up(self) -> None:
         self._data_table.scroll_page_up()
@@ -64,6 +68,9 @@ class InventoryWindow(Focusable, DataTableProgressBarWindow):
     def _sync_encumbrance(self) -> None:
         self._cur_pos = self._player.inventory.encum_bar.position
         self._max_pos = self._player.inventory.encum_bar.max_
+        self._time_left = expected_time_left(
+            self._player, self._player.inventory.encum_bar
+        )
         self._progress_title = (
             f"Encumbrance ({self._cur_pos:.0f}/{self._max_pos} cubits)"
         )
@@ -1,7 +1,7 @@
 import typing as T
 
 from pqcli.lingo import act_name
-from pqcli.mechanic import Player
+from pqcli.mechanic import Player, expected_time_left
 from pqcli.ui.curses.widgets import Focusable
 
 from .progress_bar_window import ListBoxProgressBarWindow
@@ -14,13 +14,24 @@ class PlotWindow(Focusable, ListBoxProgressBarWindow):
         self, player: Player, parent: T.Any, h: int, w: int, y: int, x: int
     ) -> None:
         super().__init__(
-            parent, h, w, y, x, " Plot Development ", show_time=True
+            parent,
+            h,
+            w,
+            y,
+            x,
+            " Plot Development ",
+            show_time=True,
+            # the last `cutoff` entries stay above the one being added
+            max_items=self.cutoff + 1,
         )
         self._on_focus_change += self._render
 
         self._player = player
+        self._player.connect("new_task", self._on_new_task)
         self._player.quest_book.connect("start_act", self._sync_act_add)
         self._player.quest_book.plot_bar.connect("change", self._sync_position)
+        self._player.quest_book.connect("sync", self.sync)
+        self._player.quest_book.plot_bar.connect("sync", self.sync)
 
         self.sync()
 
@@ -28,10 +39,13 @@ class PlotWindow(Focusable, ListBoxProgressBarWindow):
         super().stop()
         self._list_box.stop()
 
+        self._player.disconnect("new_task", self._on_new_task)
         self._player.quest_book.disconnect("start_act", self._sync_act_add)
         self._player.quest_book.plot_bar.disconnect(
             "change", self._sync_position
         )
+        self._player.quest_book.disconnect("sync", self.sync)
+        self._player.quest_book.plot_bar.disconnect("sync", self.sync)
 
     def scroll_page_up(self) -> None:
         self._list_box.scroll_page_up()
@@ -55,7 +69,6 @@ class PlotWindow(Focusable, ListBoxProgressBarWindow):
         self._render_list_box()
 
     def _sync_act_add(self, act_number: int) -> None:
-        self._list_box.delete(0, max(0, len(self._list_box) - self.cutoff))
         prev = self._list_box.get(-1)
         if prev is not None:
             self._list_box.set(-1, "[X] " + prev[4:])
@@ -63,7 +76,15 @@ class PlotWindow(Focusable, ListBoxProgressBarWindow):
         self._list_box.select(-1)
         self._render_list_box()
 
+    def _on_new_task(self) -> None:
+        # the prologue moves on with every task, not with the plot bar
+        if self._player.quest_book.act == 0:
+            self._sync_position()
+
     def _sync_position(self) -> None:
         self._cur_pos = self._player.quest_book.plot_bar.position
         self._max_pos = self._player.quest_book.plot_bar.max_
+        self._time_left = expected_time_left(
+            self._player, self._player.quest_book.plot_bar
+        )
         self._render_progress_bar()
@@ -26,6 +26,7 @@ class ProgressBarWindow(WindowWrapper):
         self._title = title
         self._cur_pos = 0.0
         self._max_pos = 1.0
+        self._time_left: T.Optional[float] = None
         self._progress_title = ""
 
         try:
@@ -75,7 +76,9 @@ class ProgressBarWindow(WindowWrapper):
                     text,
                     nwrite,
                 )
-        self._progress_bar.set_position(self._cur_pos, self._max_pos)
+        self._progress_bar.set_position(
+            self._cur_pos, self._max_pos, self._time_left
+        )
         self._progress_bar_win.noutrefresh()
 
 
@@ -130,10 +133,13 @@ class ListBoxProgressBarWindow(ProgressBarWindow):
         x: int,
         title: str,
         show_time: bool,
+        max_items: T.Optional[int] = None,
     ) -> None:
         super().__init__(parent, h, w, y, x, title, show_time)
 
-        self._list_box = ListBox(self._win, h - 4, w - 2, 1, 1)
+        self._list_box = ListBox(
+            self._win, h - 4, w - 2, 1, 1, max_items=max_items
+        )
 
     def stop(self) -> None:
         super().stop()
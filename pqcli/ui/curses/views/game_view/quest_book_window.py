@@ -1,6 +1,7 @@
+import itertools
 import typing as T
 
-from pqcli.mechanic import Player
+from pqcli.mechanic import Player, expected_time_left
 from pqcli.ui.curses.widgets import Focusable
 
 from .progress_bar_window import ListBoxProgressBarWindow
@@ -12,7 +13,17 @@ class QuestBookWindow(Focusable, ListBoxProgressBarWindow):
     def __init__(
         self, player: Player, parent: T.Any, h: int, w: int, y: int, x: int
     ) -> None:
-        super().__init__(parent, h, w, y, x, " Quests ", show_time=True)
+        super().__init__(
+            parent,
+            h,
+            w,
+            y,
+            x,
+            " Quests ",
+            show_time=True,
+            # the last `cutoff` entries stay above the one being added
+            max_items=self.cutoff + 1,
+        )
         self._on_focus_change += self._render
 
         self._player = player
@@ -20,6 +31,8 @@ class QuestBookWindow(Focusable, ListBoxProgressBarWindow):
         self._player.quest_book.quest_bar.connect(
             "change", self._sync_position
         )
+        self._player.quest_book.connect("sync", self.sync)
+        self._player.quest_book.quest_bar.connect("sync", self.sync)
 
         self.sync()
 
@@ -31,6 +44,8 @@ class QuestBookWindow(Focusable, ListBoxProgressBarWindow):
         self._player.quest_book.quest_bar.disconnect(
             "change", self._sync_position
         )
+        self._player.quest_book.disconnect("sync", self.sync)
+        self._player.quest_book.quest_bar.disconnect("sync", self.sync)
 
     def scroll_page_up(self) -> None:
         self._list_box.scroll_page_up()
@@ -46,13 +61,15 @@ class QuestBookWindow(Focusable, ListBoxProgressBarWindow):
 
     def _sync_quests(self) -> None:
         self._list_box.clear()
-        for quest_name in self._player.quest_book.quests[-self.cutoff :]:
+        quests = self._player.quest_book.quests
+        for quest_name in itertools.islice(
+            quests, max(0, len(quests) - self.cutoff), None
+        ):
             self._sync_quest_add(quest_name)
         self._list_box.select(-1)
         self._render_list_box()
 
     def _sync_quest_add(self, quest_name: str) -> None:
-        self._list_box.delete(0, max(0, len(self._list_box) - self.cutoff))
         prev = self._list_box.get(-1)
         if prev is not None:
             self._list_box.set(-1, "[X] " + prev[4:])
@@ -63,4 +80,7 @@ class QuestBookWindow(Focusable, ListBoxProgressBarWindow):
     def _sync_position(self) -> None:
         self._cur_pos = self._player.quest_book.quest_bar.position
         self._max_pos = self._player.quest_book.quest_bar.max_
+        self._time_left = expected_time_left(
+            self._player, self._player.quest_book.quest_bar
+        )
         self._render_progress_bar()
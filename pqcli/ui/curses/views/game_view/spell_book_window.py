@@ -19,6 +19,7 @@ class SpellBookWindow(Focusable, WindowWrapper):
         self._player = player
         self._player.spell_book.connect("add", self._sync_spell_add)
         self._player.spell_book.connect("change", self._sync_spell_change)
+        self._player.spell_book.connect("sync", self.sync)
 
         self.sync()
 
@@ -28,6 +29,7 @@ class SpellBookWindow(Focusable, WindowWrapper):
 
         self._player.spell_book.disconnect("add", self._sync_spell_add)
         self._player.spell_book.disconnect("change", self._sync_spell_change)
+        self._player.spell_book.disconnect("sync", self.sync)
 
     def scroll_page_up(self) -> None:
         self._data_table.scroll_page_up()
@@ -23,6 +23,8 @@ class TaskProgressWindow(Focusable, WindowWrapper):
         self._player = player
         self._player.connect("new_task", self._sync_task_name)
         self._player.task_bar.connect("change", self._sync_position)
+        self._player.connect("sync", self.sync)
+        self._player.task_bar.connect("sync", self.sync)
 
         self.sync()
 
@@ -34,6 +36,12 @@ class TaskProgressWindow(Focusable, WindowWrapper):
 
         self._player.disconnect("new_task", self._sync_task_name)
         self._player.task_bar.disconnect("change", self._sync_position)
+        self._player.disconnect("sync", self.sync)
+        self._player.task_bar.disconnect("sync", self.sync)
+
+    @property
+    def bar_width(self) -> int:
+        return self._progress_bar.getmaxyx()[1]
 
     def sync(self) -> None:
         self._sync_task_name()
@@ -1,5 +1,6 @@
 import curses
 import typing as T
+from collections import deque
 
 from pqcli.ui.curses.colors import COLOR_HIGHLIGHT, has_colors
 
@@ -7,12 +8,27 @@ from .scrollable import Scrollable
 
 
 class ListBox(Scrollable):
-    _items: T.List[str]
+    _items: T.Deque[str]
 
-    def __init__(self, parent: T.Any, h: int, w: int, y: int, x: int) -> None:
+    def __init__(
+        self,
+        parent: T.Any,
+        h: int,
+        w: int,
+        y: int,
+        x: int,
+        max_items: T.Optional[int] = None,
+    ) -> None:
         super().__init__(parent, h, w, y, x)
+        # once full, adding an item drops the oldest one
+        self._max_items = max_items
+        self._items = deque(maxlen=max_items)
         self._selected: T.Optional[int] = None
 
+    def clear(self) -> None:
+        self._items = deque(maxlen=self._max_items)
+        self.scroll_to_item(0)
+
     def add(self, text: str) -> None:
         self._items.append(text)
         self.scroll_to_item(-1)
@@ -33,7 +49,10 @@ class ListBox(Scrollable):
             return None
 
     def delete(self, idx: int, count: int = 1) -> None:
-        del self._items[idx : idx + count]
+        if idx < 0:
+            idx = max(0, idx + len(self._items))
+        for _ in range(min(count, len(self._items) - idx)):
+            del self._items[idx]
 
     def select(self, idx: T.Optional[int]) -> None:
         if idx < 0 and len(self._items):
@@ -17,35 +17,35 @@ class ProgressBar(WindowWrapper):
         self._max_pos = 1.0
 
         self._show_time = show_time
-        self._last_tick: T.Optional[T.Tuple[datetime.datetime, float]] = None
+        self._time_left: T.Optional[datetime.timedelta] = None
 
     @property
     def time_left(self) -> T.Optional[datetime.timedelta]:
-        if self._last_tick is None:
-            return None
-        time_then, pos_then = self._last_tick
-        time_now, pos_now = datetime.datetime.now(), self._cur_pos
-        div = (time_now - time_then).total_seconds()
-        if div == 0:
-            return None
-        speed = (pos_now - pos_then) / div
-        if not speed:
-            return None
-        return datetime.timedelta(seconds=(self._max_pos - pos_now) / speed)
+        return self._time_left
 
-    def set_position(self, cur_pos: float, max_pos: float) -> None:
+    def set_position(
+        self,
+        cur_pos: float,
+        max_pos: float,
+        time_left: T.Optional[float] = None,
+    ) -> None:
+        # time_left is the expected number of milliseconds until the bar is
+        # full, if known
         if not self._win:
             return
         self._win.erase()
 
-        if self._last_tick is None or cur_pos == 0 or max_pos != self._max_pos:
-            self._last_tick = (datetime.datetime.now(), cur_pos)
         self._cur_pos = cur_pos
         self._max_pos = max_pos
+        self._time_left = (
+            datetime.timedelta(milliseconds=time_left)
+            if time_left is not None
+            else None
+        )
 
         text = f"{cur_pos / max_pos:.02%}"
-        if self.time_left and self._show_time:
-            text += f" ({format_timespan(self.time_left)})"
+        if self._time_left and self._show_time:
+            text += f" ({format_timespan(self._time_left)})"
 
         x = max(0, (self.getmaxyx()[1] - len(text)) // 2)
         self._win.addnstr(0, x, text, min(len(text), self.getmaxyx()[1] - 1))
@@ -0,0 +1,45 @@
+import sys
+import time
+
+from pqcli import lingo
+from pqcli.mechanic import Simulation
+from pqcli.ui.base import BaseUserInterface
+
+
+class HeadlessUserInterface(BaseUserInterface):
+    def run(self) -> None:
+        if not self.player:
+            print("Headless mode needs --load-save.", file=sys.stderr)
+            raise SystemExit(1)
+
+        player = self.player
+        self.roster.play(player)
+        until_level = self.args.until_level
+        until_act = self.args.until_act
+        duration = self.args.duration
+
+        def done() -> bool:
+            return (
+                until_level is not None and player.level >= until_level
+            ) or (until_act is not None and player.quest_book.act >= until_act)
+
+        print(f"Running {player.name}...")
+        start = time.perf_counter()
+        report = Simulation(player).fast_forward(
+            duration=(
+                duration.total_seconds() * 1000
+                if duration is not None
+                else None
+            ),
+            until=done,
+        )
+        wall_time = time.perf_counter() - start
+
+        print(report)
+        print(
+            f"{player.name} is now level {player.level}, "
+            f"{lingo.act_name(player.quest_book.act)}; "
+            f"simulated in {wall_time:.2f}s "
+            f"({report.elapsed / 1000 / max(wall_time, 1e-9):.0f}x real time, "
+            f"{report.tasks / max(wall_time, 1e-9):.0f} tasks/s)"
+        )